@@ -2,6 +2,7 @@
 构建脚本 - 用于打包可执行文件
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -10,40 +11,78 @@ from pathlib import Path
 
 
 def run_command(command, description):
-    """运行命令并显示进度"""
+    """运行命令并显示进度 - 子进程输出直接写到终端，不在内存中缓冲"""
     print(f"\n{'='*50}")
     print(f"{description}")
     print(f"{'='*50}")
+    sys.stdout.flush()
 
     try:
-        result = subprocess.run(
-            command, shell=True, check=True, capture_output=True, text=True
-        )
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+        # 不重定向stdout/stderr，子进程直接继承终端输出
+        process = subprocess.Popen(command)
+        returncode = process.wait()
+    except OSError as e:
         print(f"错误: {e}")
-        print(f"输出: {e.stdout}")
-        print(f"错误信息: {e.stderr}")
         return False
 
+    if returncode != 0:
+        print(f"错误: 命令返回非零退出码 {returncode}")
+        return False
+    return True
+
+
+# 参与打包的源码，任一文件比上次构建的缓存新时才让PyInstaller清理缓存
+SOURCE_PATHS = ["main.py", "core", "gui", "CompressPasswordProbe.spec"]
+
+
+def _newest_mtime(paths) -> float:
+    """返回路径（含目录下所有文件）中最新的修改时间"""
+    newest = 0.0
+    for path in paths:
+        if os.path.isfile(path):
+            newest = max(newest, os.path.getmtime(path))
+        elif os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file_name in files:
+                    newest = max(newest, os.path.getmtime(os.path.join(root, file_name)))
+    return newest
+
 
 def clean_build():
-    """清理构建目录"""
-    directories_to_clean = ["build", "dist", "__pycache__"]
+    """清理构建目录 - 保留build/缓存供PyInstaller增量分析
+
+    返回build/缓存是否过期（源码在上次构建后有修改）。
+    """
+    directories_to_clean = ["dist", "__pycache__"]
 
     for directory in directories_to_clean:
         if os.path.exists(directory):
             print(f"清理目录: {directory}")
             shutil.rmtree(directory)
 
+    if not os.path.exists("build"):
+        return False
+
+    stale = _newest_mtime(SOURCE_PATHS) > _newest_mtime(["build"])
+    if stale:
+        print("源码已修改，将清理 PyInstaller 缓存")
+    else:
+        print("源码未修改，复用 build/ 缓存")
+    return stale
+
 
 def install_pyinstaller():
-    """安装 PyInstaller"""
-    return run_command("pip install pyinstaller", "安装 PyInstaller")
+    """安装 PyInstaller（已安装时跳过）"""
+    if importlib.util.find_spec("PyInstaller") is not None:
+        print("PyInstaller 已安装，跳过安装")
+        return True
+
+    return run_command(
+        [sys.executable, "-m", "pip", "install", "pyinstaller"], "安装 PyInstaller"
+    )
 
 
-def build_executable():
+def build_executable(clean=False):
     """构建可执行文件"""
     spec_file = "CompressPasswordProbe.spec"
 
@@ -51,7 +90,10 @@ def build_executable():
         print(f"错误: 未找到规格文件 {spec_file}")
         return False
 
-    return run_command(f"pyinstaller {spec_file}", "构建可执行文件")
+    command = [sys.executable, "-m", "PyInstaller", spec_file]
+    if clean:
+        command.append("--clean")
+    return run_command(command, "构建可执行文件")
 
 
 def create_package():
@@ -84,7 +126,7 @@ def main():
         return False
 
     # 清理旧的构建文件
-    clean_build()
+    cache_stale = clean_build()
 
     # 安装 PyInstaller
     if not install_pyinstaller():
@@ -92,7 +134,7 @@ def main():
         return False
 
     # 构建可执行文件
-    if not build_executable():
+    if not build_executable(clean=cache_stale):
         print("构建可执行文件失败")
         return False
 
@@ -3,10 +3,36 @@
 重构版本：统一使用7z工具处理所有格式
 """
 
+import functools
+import gc
+import itertools
+import json
+import mmap
+import multiprocessing
 import os
 import re
+import struct
 import subprocess
-from typing import Optional, Dict, List
+import sys
+import threading
+import zipfile
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Iterable, Iterator, Optional, Dict, List, Union
+
+from . import crypto_kernel
+from .crypto_kernel import verify_pkzip_headers
+
+# 程序所在目录（core的上一级），打包的7z工具和探测缓存都按该目录定位，与启动时的工作目录无关
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 class ArchiveError(Exception):
@@ -15,6 +41,251 @@ class ArchiveError(Exception):
     pass
 
 
+class CorruptArchiveError(ArchiveError):
+    """压缩文件损坏或无法识别 - 与密码无关，任何密码都无法成功"""
+
+    pass
+
+
+class _ZipCryptoEntries:
+    """ZIP传统加密成员的元数据 - 按列存储
+
+    每个字段一个紧凑数组，不为每个成员保留ZipInfo对象；
+    成员数很多时内存占用小，预检只需按下标取值。
+    """
+
+    __slots__ = (
+        "names",
+        "header_offsets",
+        "crcs",
+        "compress_sizes",
+        "check_bytes",
+        "enc_headers",
+        "smallest_index",
+    )
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.header_offsets = array("Q")
+        self.crcs = array("L")
+        self.compress_sizes = array("Q")
+        self.check_bytes = bytearray()
+        # 所有成员的12字节加密头首尾相接
+        self.enc_headers = bytearray()
+        self.smallest_index = -1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(
+        self,
+        name: str,
+        header_offset: int,
+        crc: int,
+        compress_size: int,
+        enc_header: bytes,
+        check_byte: int,
+        file_size: int,
+    ) -> None:
+        """追加一个成员，同时维护压缩大小最小的非空成员下标
+
+        空文件的CRC恒为0，解密后没有数据可供校验，任何通过校验字节的密码都能"解压"，
+        不能用来确认密码。
+        """
+        smallest = self.smallest_index
+        if file_size > 0 and (smallest < 0 or compress_size < self.compress_sizes[smallest]):
+            self.smallest_index = len(self.names)
+        self.names.append(name)
+        self.header_offsets.append(header_offset)
+        self.crcs.append(crc)
+        self.compress_sizes.append(compress_size)
+        self.check_bytes.append(check_byte)
+        self.enc_headers += enc_header
+
+
+def _hidden_startupinfo():
+    """Windows下隐藏7z控制台窗口，避免每次启动都弹出窗口"""
+    if os.name != "nt":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return startupinfo
+
+
+# Windows下不为7z子进程创建控制台
+_NO_WINDOW_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+class _ChildProcessJob:
+    """Windows作业对象 - 作业句柄关闭（程序退出或崩溃）时系统终止所有关联的7z子进程
+
+    非Windows平台或创建失败时为空操作。
+    """
+
+    _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+    _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+
+    def __init__(self):
+        self._kernel32 = None
+        self._handle = None
+        if os.name != "nt":
+            return
+
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class IoCounters(ctypes.Structure):
+                _fields_ = [
+                    ("ReadOperationCount", ctypes.c_ulonglong),
+                    ("WriteOperationCount", ctypes.c_ulonglong),
+                    ("OtherOperationCount", ctypes.c_ulonglong),
+                    ("ReadTransferCount", ctypes.c_ulonglong),
+                    ("WriteTransferCount", ctypes.c_ulonglong),
+                    ("OtherTransferCount", ctypes.c_ulonglong),
+                ]
+
+            class BasicLimitInformation(ctypes.Structure):
+                _fields_ = [
+                    ("PerProcessUserTimeLimit", ctypes.c_int64),
+                    ("PerJobUserTimeLimit", ctypes.c_int64),
+                    ("LimitFlags", wintypes.DWORD),
+                    ("MinimumWorkingSetSize", ctypes.c_size_t),
+                    ("MaximumWorkingSetSize", ctypes.c_size_t),
+                    ("ActiveProcessLimit", wintypes.DWORD),
+                    ("Affinity", ctypes.c_size_t),
+                    ("PriorityClass", wintypes.DWORD),
+                    ("SchedulingClass", wintypes.DWORD),
+                ]
+
+            class ExtendedLimitInformation(ctypes.Structure):
+                _fields_ = [
+                    ("BasicLimitInformation", BasicLimitInformation),
+                    ("IoInfo", IoCounters),
+                    ("ProcessMemoryLimit", ctypes.c_size_t),
+                    ("JobMemoryLimit", ctypes.c_size_t),
+                    ("PeakProcessMemoryUsed", ctypes.c_size_t),
+                    ("PeakJobMemoryUsed", ctypes.c_size_t),
+                ]
+
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+            kernel32.AssignProcessToJobObject.argtypes = (wintypes.HANDLE, wintypes.HANDLE)
+
+            handle = kernel32.CreateJobObjectW(None, None)
+            if not handle:
+                raise OSError(ctypes.get_last_error(), "CreateJobObjectW失败")
+
+            info = ExtendedLimitInformation()
+            info.BasicLimitInformation.LimitFlags = self._JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+            if not kernel32.SetInformationJobObject(
+                wintypes.HANDLE(handle),
+                self._JOB_OBJECT_EXTENDED_LIMIT_INFORMATION,
+                ctypes.byref(info),
+                ctypes.sizeof(info),
+            ):
+                kernel32.CloseHandle(wintypes.HANDLE(handle))
+                raise OSError(ctypes.get_last_error(), "SetInformationJobObject失败")
+
+            self._kernel32 = kernel32
+            self._handle = handle
+        except (OSError, AttributeError, ImportError) as e:
+            print(f"创建作业对象失败，7z子进程不受作业管理: {str(e)}")
+
+    def assign(self, process: subprocess.Popen) -> None:
+        """将子进程加入作业"""
+        if self._handle is not None:
+            self._kernel32.AssignProcessToJobObject(self._handle, int(process._handle))
+
+
+# 批量测试工作进程的状态（每个工作进程初始化一次）
+_worker_manager = None
+_worker_found_event = None
+# 工作进程内按路径缓存的破解会话，同一压缩包的后续分片不再重新绑定和校验
+_worker_sessions: Dict[str, "ArchiveSession"] = {}
+
+# JIT编译的批量预检内核模块（core.cpu_kernels），首次使用时导入；False表示numba不可用
+_cpu_kernels = None
+
+
+def _load_cpu_kernels():
+    """按需导入批量预检内核，缺少numba/numpy时返回None"""
+    global _cpu_kernels
+    if _cpu_kernels is None:
+        try:
+            from . import cpu_kernels
+
+            _cpu_kernels = cpu_kernels
+        except Exception as e:
+            print(f"批量预检内核不可用，逐个测试密码: {e}")
+            _cpu_kernels = False
+    return _cpu_kernels or None
+
+
+def _init_batch_worker(found_event) -> None:
+    """批量测试工作进程初始化 - 每个进程只创建一次ArchiveManager"""
+    global _worker_manager, _worker_found_event
+    _worker_manager = ArchiveManager()
+    _worker_found_event = found_event
+    # 工作进程只循环测试密码，测试路径不产生循环引用，关闭循环GC避免不定时的停顿；
+    # 进程内没有其他线程，放宽线程切换间隔以减少GIL检查
+    gc.disable()
+    sys.setswitchinterval(0.05)
+
+
+def _test_password_shard(
+    archive_path: str, passwords: Union[bytes, List[Union[str, bytes]]], offset: int
+) -> Optional[int]:
+    """在工作进程中逐个测试一段密码，返回命中密码在整个列表中的下标
+
+    passwords可以是以换行分隔打包的字节串（见ArchiveManager._submit_shard）。
+    """
+    if isinstance(passwords, bytes):
+        passwords = passwords.split(b"\n")
+    session = _worker_sessions.get(archive_path)
+    if session is None:
+        session = _worker_manager.open_session(archive_path)
+        _worker_sessions[archive_path] = session
+    return _run_password_shard(session, _worker_found_event, passwords, offset)
+
+
+def _run_password_shard(
+    session, found_event, passwords: List[Union[str, bytes]], offset: int
+) -> Optional[int]:
+    """逐个测试一段密码，其他分片已命中时提前退出"""
+    # 整个分片一次性编码，循环内不再逐个编码；字典读取器直接提供字节串
+    encoded = [
+        password if isinstance(password, bytes) else password.encode("utf-8")
+        for password in passwords
+    ]
+    try_password_bytes = session.try_password_bytes
+    # 支持批量预检的格式先整批排除一定错误的密码，只逐个测试剩下的候选
+    indices = session.candidate_indices(encoded)
+    if indices is None:
+        indices = range(len(encoded))
+    for i in indices:
+        # 每次猜测都可能启动7z子进程，检查事件的开销可以忽略
+        if found_event.is_set():
+            return None
+        if try_password_bytes(encoded[i]):
+            found_event.set()
+            return offset + int(i)
+    return None
+
+
+class BoundArchive:
+    """已绑定的压缩包 - 破解期间不变的第一卷路径、大小和测试函数"""
+
+    __slots__ = ("path", "size", "is_large", "test_fn")
+
+    def __init__(self, path: str, size: int, is_large: bool, test_fn: Callable):
+        self.path = path
+        self.size = size
+        self.is_large = is_large
+        self.test_fn = test_fn
+
+
 class UnifiedArchiveHandler:
     """统一的压缩文件处理器 - 基于7z工具"""
 
@@ -27,26 +298,103 @@ class UnifiedArchiveHandler:
     # 分卷压缩包模式
     VOLUME_PATTERNS = {
         # ZIP分卷模式：.z01, .z02, ..., .z99
-        "zip_volume": (re.compile(r"\.z\d{2}$", re.IGNORECASE), ".zip"),
+        "zip_volume": (re.compile(r"\.z\d{2}\Z", re.IGNORECASE), ".zip"),
         # RAR分卷模式1：.r00, .r01, ..., .r99
-        "rar_volume1": (re.compile(r"\.r\d{2}$", re.IGNORECASE), ".rar"),
+        "rar_volume1": (re.compile(r"\.r\d{2}\Z", re.IGNORECASE), ".rar"),
         # RAR分卷模式2：.part1.rar, .part2.rar, ...
-        "rar_volume2": (re.compile(r"\.part\d+\.rar$", re.IGNORECASE), ".rar"),
+        "rar_volume2": (re.compile(r"\.part\d+\.rar\Z", re.IGNORECASE), ".rar"),
         # 7Z分卷模式：.7z.001, .7z.002, ...
-        "7z_volume": (re.compile(r"\.7z\.\d{3}$", re.IGNORECASE), ".7z"),
+        "7z_volume": (re.compile(r"\.7z\.\d{3}\Z", re.IGNORECASE), ".7z"),
+    }
+
+    # zipfile可直接解压的压缩方法：存储、Deflate、BZIP2、LZMA
+    ZIPFILE_COMPRESS_TYPES = frozenset(
+        {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+    )
+
+    # 分卷扩展名首字母到格式的映射：.z01 -> ZIP, .r00 -> RAR
+    VOLUME_TAIL_FORMATS = {"z": ".zip", "r": ".rar"}
+
+    # 所有分卷模式合并的单个正则，命名分组标识匹配到的分卷类型
+    VOLUME_PATTERN = re.compile(
+        r"(?:(?P<zip_volume>\.z\d{2})|(?P<rar_volume1>\.r\d{2})"
+        r"|(?P<rar_volume2>\.part\d+\.rar)|(?P<sevenzip_volume>\.7z\.\d{3}))\Z",
+        re.IGNORECASE,
+    )
+
+    # 分卷类型（VOLUME_PATTERN的分组名）到第一卷文件名后缀的映射
+    FIRST_VOLUME_SUFFIXES = {
+        "zip_volume": ".zip",
+        "rar_volume1": ".rar",
+        "rar_volume2": ".part1.rar",
+        "sevenzip_volume": ".7z.001",
     }
 
+    # 7z l 输出中的文件数量及加密标记，整个输出只需扫描一遍
+    INFO_PATTERN = re.compile(
+        r"(?P<files>\d+)\s+files?|encrypted|aes|method", re.IGNORECASE
+    )
+
+    # 7z l -slt 输出中最小测试文件选择需要的字段（每行 "字段 = 值"）
+    # Size只匹配纯数字，解析时可直接交给int()而无需异常处理
+    SLT_FIELD_PATTERN = re.compile(
+        r"^[ \t]*(?:Size = (?P<size>\d+)|(?P<field>Path|Attributes|Encrypted) = (?P<value>.*?))[ \t\r]*$",
+        re.MULTILINE,
+    )
+
+    # ZIP传统加密预检最多校验的成员数
+    ZIP_PRECHECK_MEMBERS = 4
+
+    # 优先用作测试目标的常见小文件类型
+    PREFERRED_TEST_EXTENSIONS = frozenset(
+        (".txt", ".jpg", ".png", ".gif", ".pdf", ".doc", ".xml", ".json", ".ini")
+    )
+
+    # 列出文件的超时时间（秒）
+    LIST_TIMEOUT = 30
+    # 查找测试文件时，遇到层级不超过该深度且不超过该大小的文件即停止
+    IDEAL_TEST_FILE_DEPTH = 1
+    IDEAL_TEST_FILE_SIZE = 4 * 1024
+
+    # 可识别的压缩文件签名：ZIP本地头/空压缩包/跨卷标记、7z、RAR4/RAR5
+    ARCHIVE_SIGNATURES = (
+        b"PK\x03\x04",
+        b"PK\x05\x06",
+        b"PK\x07\x08",
+        crypto_kernel.SEVENZIP_SIGNATURE,
+        crypto_kernel.RAR4_SIGNATURE[:6],
+    )
+
+    # 最小测试文件的持久化缓存（位于程序目录）及最多保留的条目数
+    PROBE_CACHE_FILE = os.path.join(_APP_DIR, ".archive_probe_cache.json")
+    PROBE_CACHE_SIZE = 256
+
     def __init__(self):
         self.sevenzip_path = self._find_bundled_7zip()
         if not self.sevenzip_path:
             raise ArchiveError("7z工具不可用，无法处理压缩文件")
         print(f"7z工具路径: {self.sevenzip_path}")
 
+        # 7z子进程所属的作业对象（仅Windows），程序退出时不会遗留卡住的7z进程
+        self._job = _ChildProcessJob()
+
+        # 已解析的压缩包状态缓存: 压缩包路径 -> {"zip_headers": ..., "smallest_file": ...}
+        # 破解过程中只解析一次，每次猜测只做廉价的密码校验
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+        # (绝对路径, 修改时间, 大小) -> 最小测试文件，跨会话持久化，首次使用时加载
+        self._smallest_file_cache: Optional[Dict[tuple, Dict]] = None
+
+        # 格式 -> 密码测试函数，未列出的格式直接交给7z
+        self._test_fn_by_ext: Dict[str, Callable[[BoundArchive, bytes], bool]] = {
+            ".zip": self._test_zip_password,
+            ".7z": self._test_7z_password,
+            ".rar": self._test_rar_password,
+        }
+
     def _find_bundled_7zip(self) -> Optional[str]:
         """查找项目打包的7z工具"""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        bundled_7z_path = os.path.join(current_dir, "..", "lib", "7z", "win", "7z.exe")
-        bundled_7z_path = os.path.abspath(bundled_7z_path)
+        bundled_7z_path = os.path.join(_APP_DIR, "lib", "7z", "win", "7z.exe")
 
         if os.path.exists(bundled_7z_path):
             return bundled_7z_path
@@ -54,91 +402,369 @@ class UnifiedArchiveHandler:
 
     def detect_archive_type(self, file_path: str) -> Optional[str]:
         """检测压缩文件类型，支持分卷压缩包"""
-        filename = os.path.basename(file_path).lower()
-        ext = os.path.splitext(file_path)[1].lower()
-
-        # 首先检查标准格式
-        if ext in self.SUPPORTED_FORMATS:
-            return ext
-
-        # 检查分卷格式
-        for pattern_name, (pattern, format_ext) in self.VOLUME_PATTERNS.items():
-            if pattern.search(filename):
-                return format_ext
-
-        return None
+        return _detect_archive_type(file_path)
 
     def is_supported(self, file_path: str) -> bool:
         """检查文件格式是否支持"""
         return self.detect_archive_type(file_path) is not None
 
     def find_first_volume(self, file_path: str) -> str:
-        """查找分卷压缩包的第一卷"""
-        filename = os.path.basename(file_path)
+        """根据分卷文件名推导第一卷路径
+
+        不做缓存：结果取决于第一卷文件当前是否存在；非分卷文件名不访问文件系统，
+        破解过程中由会话绑定一次压缩包，不会每次猜测都查找。
+        """
         dirname = os.path.dirname(file_path)
-        base_name = filename.lower()
-
-        # 分卷文件名映射规则
-        volume_rules = [
-            # ZIP分卷：找 .zip 文件
-            (r"\.z\d{2}$", ".zip"),
-            # RAR分卷模式1：找 .rar 文件
-            (r"\.r\d{2}$", ".rar"),
-            # RAR分卷模式2：找 .part1.rar 文件
-            (r"\.part\d+\.rar$", ".part1.rar"),
-            # 7Z分卷：找 .7z.001 文件
-            (r"\.7z\.\d{3}$", ".7z.001"),
-        ]
+        base_name = os.path.basename(file_path).lower()
 
-        for pattern, replacement in volume_rules:
-            if re.search(pattern, base_name):
-                first_name = re.sub(pattern, replacement, base_name)
-                first_path = os.path.join(dirname, first_name)
-                if os.path.exists(first_path):
-                    return first_path
+        # 各分卷模式互斥，一次匹配即可确定类型
+        match = self.VOLUME_PATTERN.search(base_name)
+        if match:
+            first_name = (
+                base_name[: match.start()] + self.FIRST_VOLUME_SUFFIXES[match.lastgroup]
+            )
+            first_path = os.path.join(dirname, first_name)
+            if os.path.exists(first_path):
+                return first_path
 
         # 如果找不到第一卷，返回原文件路径
         return file_path
 
     def test_password(self, archive_path: str, password: str) -> bool:
-        """使用7z工具测试密码 - 支持大文件优化"""
-        if not os.path.exists(archive_path):
+        """使用7z工具测试密码 - 支持大文件优化
+
+        返回False仅表示密码错误；压缩包损坏或无法识别时抛出CorruptArchiveError。
+        """
+        return self.test_password_bytes(archive_path, password.encode("utf-8"))
+
+    def test_password_bytes(self, archive_path: str, pw_bytes: bytes) -> bool:
+        """测试UTF-8编码的密码，批量调用方可预先编码以省去每次猜测的编码开销"""
+        try:
+            archive = self.bind_archive(archive_path)
+        except ArchiveError:
             return False
+        return self.test_password_bound(archive, pw_bytes)
 
-        # 检查文件大小，决定使用哪种测试方法
-        file_size = os.path.getsize(archive_path)
-        if file_size > self.LARGE_FILE_THRESHOLD:
-            print(
-                f"检测到大文件 ({file_size / (1024*1024):.1f}MB)，使用单文件解压优化..."
-            )
+    def bind_archive(self, archive_path: str) -> BoundArchive:
+        """绑定压缩包：解析第一卷、stat一次并选定测试函数，文件不存在时抛出ArchiveError"""
+        first_volume_path = self.find_first_volume(archive_path)
+        try:
+            size = os.stat(first_volume_path).st_size
+        except OSError as e:
+            raise ArchiveError(f"压缩文件不存在: {first_volume_path}") from e
+
+        test_fn = self._test_fn_by_ext.get(
+            _detect_archive_type(first_volume_path), self._test_password_with_7z
+        )
+        is_large = size > self.LARGE_FILE_THRESHOLD
+        if is_large:
+            # 绑定时提示一次，不在每次猜测时输出
+            print(f"检测到大文件 ({size / (1024*1024):.1f}MB)，使用单文件解压优化...")
+        return BoundArchive(first_volume_path, size, is_large, test_fn)
+
+    def test_password_bound(self, archive: BoundArchive, pw_bytes: bytes) -> bool:
+        """测试已绑定压缩包的密码 - 不做stat和分卷查找"""
+        return archive.test_fn(archive, pw_bytes)
+
+    def _test_zip_password(self, archive: BoundArchive, pw_bytes: bytes) -> bool:
+        """ZIP密码测试 - 传统加密先在进程内校验，其余交给7z"""
+        # 非ASCII密码在ZIP中的编码方式不确定，交给7z判断
+        if pw_bytes.isascii():
+            # ZIP传统加密预检，校验字节不匹配的密码无需启动7z
+            if not self._precheck_zip_password(archive.path, pw_bytes):
+                return False
+
+            # ZIP传统加密可直接在内存中读取最小成员验证，无需写盘
+            zip_result = self._test_zip_password_in_memory(archive.path, pw_bytes)
+            if zip_result is not None:
+                return zip_result
+
+        return self._test_password_with_7z(archive, pw_bytes)
+
+    def _test_7z_password(self, archive: BoundArchive, pw_bytes: bytes) -> bool:
+        """7Z密码测试 - AES预检通过后再交给7z"""
+        password = pw_bytes.decode("utf-8", errors="ignore")
+
+        # 7z AES预检，解密首个密文块并试解压数据流开头，不启动7z
+        if not self._precheck_7z_password(archive.path, password):
+            return False
+
+        return self._run_7z_password_test(archive, password)
+
+    def _test_rar_password(self, archive: BoundArchive, pw_bytes: bytes) -> bool:
+        """RAR密码测试 - 密码校验值/加密块头预检通过后再交给7z"""
+        password = pw_bytes.decode("utf-8", errors="ignore")
+
+        # RAR5比对PBKDF2密码校验值，RAR4头部加密校验首个块头CRC，均无需解压
+        if not self._precheck_rar_password(archive.path, password):
+            return False
+
+        return self._run_7z_password_test(archive, password)
+
+    def _test_password_with_7z(self, archive: BoundArchive, pw_bytes: bytes) -> bool:
+        """直接使用7z工具测试密码（RAR及无法预检的格式）"""
+        return self._run_7z_password_test(archive, pw_bytes.decode("utf-8", errors="ignore"))
+
+    def _run_7z_password_test(self, archive: BoundArchive, password: str) -> bool:
+        """启动7z测试密码 - 大文件使用单文件解压优化"""
+        # 绑定时已根据文件大小决定使用哪种测试方法
+        if archive.is_large:
             return self._test_password_with_single_file_extraction(
-                archive_path, password
+                archive.path, password
             )
         else:
-            return self._test_password_with_full_test(archive_path, password)
+            return self._test_password_with_full_test(archive.path, password)
+
+    def _archive_state(self, archive_path: str) -> Dict[str, Any]:
+        """获取压缩包的缓存状态"""
+        state = self._cache.get(archive_path)
+        if state is None:
+            state = self._cache[archive_path] = {}
+        return state
+
+    def close_archive(self, archive_path: str) -> None:
+        """释放压缩包的缓存状态"""
+        self._cache.pop(archive_path, None)
+
+    def _precheck_zip_password(self, archive_path: str, pw_bytes: bytes) -> bool:
+        """ZIP传统加密预检 - 返回False表示密码一定错误，True表示需要进一步验证"""
+        headers = self._get_zip_crypto_headers(archive_path)
+        if not headers:
+            return True
+
+        # 校验多个成员的校验字节，进一步减少需要解压验证的错误密码
+        return verify_pkzip_headers(
+            pw_bytes,
+            headers.enc_headers,
+            headers.check_bytes,
+            min(len(headers), self.ZIP_PRECHECK_MEMBERS),
+        )
 
-    def _test_password_with_full_test(self, archive_path: str, password: str) -> bool:
-        """使用7z t命令测试整个压缩包（适用于小文件）"""
-        try:
-            # 使用7z t命令测试压缩包完整性和密码
-            cmd = [self.sevenzip_path, "t", f"-p{password}", archive_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    def get_zipcrypto_verifier(self, archive_path: str) -> Optional[tuple]:
+        """获取ZIP传统加密预检所用的 (加密头, 校验字节, 成员数)，不适用时返回None
 
-            # 检查返回码和输出
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                return "everything is ok" in output
+        供GPU批量预检使用，校验的成员与_precheck_zip_password相同。
+        """
+        headers = self._get_zip_crypto_headers(archive_path)
+        if not headers:
+            return None
+        count = min(len(headers), self.ZIP_PRECHECK_MEMBERS)
+        return bytes(headers.enc_headers[: count * 12]), bytes(headers.check_bytes[:count]), count
+
+    def _test_zip_password_in_memory(
+        self, archive_path: str, pw_bytes: bytes
+    ) -> Optional[bool]:
+        """读取压缩大小最小的非空传统加密成员验证密码（CRC校验通过即密码正确）
+
+        返回None表示不适用（AES加密、只有空文件或zipfile不支持的压缩方法），需交给7z处理。
+        """
+        headers = self._get_zip_crypto_headers(archive_path)
+        if not headers or headers.smallest_index < 0:
+            return None
 
+        smallest_name = headers.names[headers.smallest_index]
+        try:
+            with zipfile.ZipFile(archive_path) as zip_file:
+                info = zip_file.getinfo(smallest_name)
+                if info.compress_type not in self.ZIPFILE_COMPRESS_TYPES:
+                    return None
+                with zip_file.open(info, pwd=pw_bytes) as member:
+                    while member.read(1024 * 1024):
+                        pass
+            return True
+        except (RuntimeError, zipfile.BadZipFile, zlib.error, EOFError):
+            # 密码错误 / CRC不匹配 / 解压数据损坏
             return False
+        except NotImplementedError as e:
+            # zipfile不支持的压缩或加密方式
+            print(f"ZIP内存验证不支持，回退到7z: {str(e)}")
+            return None
+
+    def _precheck_7z_password(self, archive_path: str, password: str) -> bool:
+        """7z AES加密预检 - 返回False表示密码一定错误，True表示需要7z进一步验证"""
+        params = self._get_7z_aes_params(archive_path)
+        if params is None:
+            return True
+        return crypto_kernel.verify_7z_password(password, params)
+
+    def _get_7z_aes_params(self, archive_path: str) -> Optional[Dict]:
+        """获取7z第一个AES数据流的盐、IV和开头一段密文（每个压缩包只解析一次）"""
+        state = self._archive_state(archive_path)
+        if "sevenzip_aes" in state:
+            return state["sevenzip_aes"]
+
+        params = None
+        if crypto_kernel.Cipher is not None and self.detect_archive_type(
+            archive_path
+        ) == ".7z" and not self._is_volume_file(archive_path):
+            try:
+                params = crypto_kernel.read_7z_aes_params(archive_path)
+            except Exception as e:
+                print(f"解析7z加密头失败，跳过预检: {str(e)}")
+                params = None
+
+        state["sevenzip_aes"] = params
+        return params
+
+    def _precheck_rar_password(self, archive_path: str, password: str) -> bool:
+        """RAR加密预检 - 返回False表示密码一定错误，True表示需要7z进一步验证"""
+        params = self._get_rar_crypto_params(archive_path)
+        if params is None:
+            return True
+        return crypto_kernel.verify_rar_password(password, params)
+
+    def _get_rar_crypto_params(self, archive_path: str) -> Optional[Dict]:
+        """获取RAR的KDF盐和密码校验数据（每个压缩包只解析一次）
+
+        加密参数位于卷开头的块头中，分卷同样适用。
+        """
+        state = self._archive_state(archive_path)
+        if "rar_crypto" in state:
+            return state["rar_crypto"]
+
+        try:
+            params = crypto_kernel.read_rar_crypto_params(archive_path)
+        except Exception as e:
+            print(f"解析RAR加密头失败，跳过预检: {str(e)}")
+            params = None
+
+        state["rar_crypto"] = params
+        return params
+
+    def _get_zip_crypto_headers(self, archive_path: str) -> _ZipCryptoEntries:
+        """获取ZIP传统加密成员的加密头（每个压缩包只解析一次）"""
+        state = self._archive_state(archive_path)
+        if "zip_headers" in state:
+            return state["zip_headers"]
+
+        headers = _ZipCryptoEntries()
+        if self.detect_archive_type(archive_path) == ".zip" and not self._is_volume_file(
+            archive_path
+        ):
+            try:
+                headers = self._parse_zip_crypto_headers(archive_path)
+            except Exception as e:
+                print(f"解析ZIP加密头失败，跳过预检: {str(e)}")
+                headers = _ZipCryptoEntries()
+
+        state["zip_headers"] = headers
+        return headers
+
+    def _parse_zip_crypto_headers(self, archive_path: str) -> _ZipCryptoEntries:
+        """解析中央目录并读取每个传统加密成员的12字节加密头"""
+        headers = _ZipCryptoEntries()
+        with zipfile.ZipFile(archive_path) as zip_file, open(archive_path, "rb") as fp:
+            for info in zip_file.infolist():
+                # 仅处理传统加密；AES加密(方法99)和强加密交给7z处理
+                if not info.flag_bits & 0x1 or info.flag_bits & 0x40:
+                    continue
+                if info.compress_type == 99:
+                    continue
+
+                fp.seek(info.header_offset)
+                local_header = fp.read(30)
+                if len(local_header) != 30 or local_header[:4] != b"PK\x03\x04":
+                    continue
+                name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+                fp.seek(name_len + extra_len, os.SEEK_CUR)
+                enc_header = fp.read(12)
+                if len(enc_header) != 12:
+                    continue
+
+                date_time = info.date_time
+                mod_time = (date_time[3] << 11) | (date_time[4] << 5) | (date_time[5] // 2)
+                # 使用数据描述符时校验字节取自修改时间，否则取自CRC32高字节
+                if info.flag_bits & 0x8:
+                    check_byte = (mod_time >> 8) & 0xFF
+                else:
+                    check_byte = (info.CRC >> 24) & 0xFF
+
+                headers.append(
+                    info.filename,
+                    info.header_offset,
+                    info.CRC,
+                    info.compress_size,
+                    enc_header,
+                    check_byte,
+                    info.file_size,
+                )
+        return headers
 
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.CalledProcessError,
-            Exception,
-        ) as e:
-            print(f"密码测试失败: {str(e)}")
+    def _test_password_with_full_test(self, archive_path: str, password: str) -> bool:
+        """使用7z t命令测试整个压缩包（适用于小文件）"""
+        # 使用7z t命令测试压缩包完整性和密码
+        # -bso0/-bsp0: 关闭文件列表和进度输出，结果只看退出码，错误信息仍走stderr
+        cmd = [
+            self.sevenzip_path,
+            "t",
+            "-bso0",
+            "-bsp0",
+            f"-p{password}",
+            archive_path,
+        ]
+        try:
+            returncode, error_output = self._run_7z(cmd, timeout=60)
+        except subprocess.TimeoutExpired as e:
+            print(f"密码测试超时: {str(e)}")
             return False
 
+        # 7z仅在测试全部通过时返回0，无需解码完整的文件列表输出
+        if returncode == 0:
+            return True
+
+        self._raise_if_corrupt(archive_path, error_output)
+        return False
+
+    def _run_7z(self, cmd: List[str], timeout: float):
+        """运行7z并丢弃标准输出，返回 (退出码, stderr文本)
+
+        超时时终止子进程并抛出subprocess.TimeoutExpired。
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            startupinfo=_hidden_startupinfo(),
+            creationflags=_NO_WINDOW_FLAGS,
+        )
+        self._job.assign(process)
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # 同一个处理器可能并发运行多个7z，只终止超时的这一个
+            process.kill()
+            process.communicate()
+            raise
+        return process.returncode, stderr.decode("utf-8", errors="replace")
+
+    def _raise_if_corrupt(self, archive_path: str, output: str) -> None:
+        """7z无法将文件识别为压缩包时抛出CorruptArchiveError，避免每次猜测都重复失败"""
+        output = output.lower()
+        if "can not open the file as archive" in output or "is not archive" in output:
+            raise CorruptArchiveError(f"7z无法打开压缩文件: {archive_path}")
+
+    def validate_archive(self, archive_path: str) -> None:
+        """校验压缩包可读且带有可识别的格式签名，失败时抛出CorruptArchiveError
+
+        只检查签名，不区分扩展名与实际格式（7z会按内容识别格式）。
+        """
+        try:
+            with open(archive_path, "rb") as fp:
+                head = fp.read(8)
+        except OSError as e:
+            raise CorruptArchiveError(f"无法读取压缩文件: {str(e)}") from e
+
+        if head.startswith(self.ARCHIVE_SIGNATURES):
+            return
+        # 分卷的后续卷没有签名
+        if self._is_volume_file(archive_path):
+            return
+        # 自解压或带前置数据的ZIP通过中央目录识别
+        if zipfile.is_zipfile(archive_path):
+            return
+        raise CorruptArchiveError(f"不是可识别的压缩文件: {archive_path}")
+
     def _test_password_with_single_file_extraction(
         self, archive_path: str, password: str
     ) -> bool:
@@ -150,151 +776,224 @@ class UnifiedArchiveHandler:
                 print("未找到合适的测试文件，回退到完整测试...")
                 return self._test_password_with_full_test(archive_path, password)
 
-            print(
-                f"使用最小文件进行测试: {smallest_file['name']} ({smallest_file['size']} bytes)"
-            )
-
-            # 使用7z e命令解压单个文件到临时位置
-            import tempfile
-
-            temp_dir = tempfile.mkdtemp()
+            # 修复文件名路径分隔符 - 7z需要单反斜杠才能正确匹配Unicode文件名
+            target_filename = smallest_file["name"].replace("\\\\", "\\")
+
+            # 解压到标准输出并直接丢弃，不落盘也不经过Python
+            cmd = [
+                self.sevenzip_path,
+                "e",
+                "-so",
+                "-bsp0",  # 关闭进度输出（使用-so时进度写入stderr）
+                f"-p{password}",
+                archive_path,
+                target_filename,
+                "-y",  # 自动回答yes
+            ]
+
+            returncode, error_output = self._run_7z(cmd, timeout=30)
+
+            # 使用-so时7z的提示信息全部输出到stderr
+            if returncode == 0:
+                # 检查是否真的解压了文件
+                if "Files: 0" in error_output or "No files to process" in error_output:
+                    print("文件名匹配失败，回退到完整测试")
+                    return self._test_password_with_full_test(archive_path, password)
+                # 真正成功解压，密码正确
+                return True
+
+            # 检查是否是密码错误
+            if "wrong password" in error_output.lower() or (
+                "ERROR:" in error_output and "password" in error_output.lower()
+            ):
+                return False
 
-            try:
-                # 修复文件名路径分隔符 - 7z需要单反斜杠才能正确匹配Unicode文件名
-                target_filename = smallest_file["name"].replace("\\\\", "\\")
-
-                cmd = [
-                    self.sevenzip_path,
-                    "e",
-                    f"-p{password}",
-                    archive_path,
-                    target_filename,
-                    f"-o{temp_dir}",  # 输出到临时目录
-                    "-y",  # 自动回答yes
-                ]
+            # 其他错误，可能需要回退
+            self._raise_if_corrupt(archive_path, error_output)
+            print(f"单文件解压遇到未知错误，回退到完整测试")
+            return self._test_password_with_full_test(archive_path, password)
 
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-                # 检查结果 - 更严格的检查逻辑
-                error_output = result.stderr
-                stdout_output = result.stdout
-
-                if result.returncode == 0:
-                    # 检查是否真的解压了文件
-                    if (
-                        "Files: 0" in stdout_output
-                        or "No files to process" in stdout_output
-                    ):
-                        print("文件名匹配失败，回退到完整测试")
-                        return self._test_password_with_full_test(
-                            archive_path, password
-                        )
-                    else:
-                        # 真正成功解压，密码正确
-                        return True
-                else:
-                    # 检查是否是密码错误
-                    if (
-                        "wrong password" in error_output.lower()
-                        or "wrong password" in stdout_output.lower()
-                        or "ERROR:" in error_output
-                        and "password" in error_output.lower()
-                    ):
-                        return False
-                    else:
-                        # 其他错误，可能需要回退
-                        print(f"单文件解压遇到未知错误，回退到完整测试")
-                        return self._test_password_with_full_test(
-                            archive_path, password
-                        )
-
-            finally:
-                # 清理临时目录
-                import shutil
-
-                shutil.rmtree(temp_dir, ignore_errors=True)
-
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.CalledProcessError,
-            Exception,
-        ) as e:
-            print(f"单文件解压测试失败，回退到完整测试: {str(e)}")
+        except subprocess.TimeoutExpired as e:
+            print(f"单文件解压测试超时，回退到完整测试: {str(e)}")
             return self._test_password_with_full_test(archive_path, password)
 
     def _find_smallest_encrypted_file(self, archive_path: str) -> Optional[Dict]:
-        """查找压缩包中最小的文件作为密码测试目标"""
+        """查找压缩包中最小的文件作为密码测试目标（结果按压缩包缓存）"""
+        state = self._archive_state(archive_path)
+        if "smallest_file" not in state:
+            smallest_file = self._lookup_smallest_encrypted_file(archive_path)
+            state["smallest_file"] = smallest_file
+            if smallest_file:
+                print(
+                    f"使用最小文件进行测试: {smallest_file['name']} ({smallest_file['size']} bytes)"
+                )
+        return state["smallest_file"]
+
+    def _lookup_smallest_encrypted_file(self, archive_path: str) -> Optional[Dict]:
+        """按 (路径, 修改时间, 大小) 查询持久化缓存，未命中时调用7z列出文件"""
+        stat = os.stat(archive_path)
+        key = (os.path.abspath(archive_path), stat.st_mtime_ns, stat.st_size)
+
+        if self._smallest_file_cache is None:
+            self._smallest_file_cache = self._load_probe_cache()
+        if key in self._smallest_file_cache:
+            return self._smallest_file_cache[key]
+
+        smallest_file = self._list_smallest_encrypted_file(archive_path)
+        # 列出失败可能是临时错误，不写入缓存
+        if smallest_file is not None:
+            self._smallest_file_cache[key] = smallest_file
+            self._save_probe_cache()
+        return smallest_file
+
+    def _load_probe_cache(self) -> Dict[tuple, Dict]:
+        """加载持久化的最小测试文件缓存"""
+        cache = {}
         try:
-            # 使用7z l命令获取详细文件列表
-            cmd = [self.sevenzip_path, "l", "-slt", archive_path]  # -slt: 技术信息模式
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode != 0:
-                return None
-
-            return self._parse_file_list_for_smallest(result.stdout)
+            with open(self.PROBE_CACHE_FILE, "r", encoding="utf-8") as f:
+                for path, mtime_ns, size, smallest_file in json.load(f):
+                    cache[(path, mtime_ns, size)] = smallest_file
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"加载探测缓存失败: {str(e)}")
+        return cache
+
+    def _save_probe_cache(self) -> None:
+        """保存最小测试文件缓存 - 先写临时文件再替换，避免写到一半的缓存文件"""
+        entries = [
+            [path, mtime_ns, size, smallest_file]
+            for (path, mtime_ns, size), smallest_file in self._smallest_file_cache.items()
+        ][-self.PROBE_CACHE_SIZE :]
+        temp_file = f"{self.PROBE_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(temp_file, self.PROBE_CACHE_FILE)
+        except OSError as e:
+            print(f"保存探测缓存失败: {str(e)}")
+
+    def _list_smallest_encrypted_file(self, archive_path: str) -> Optional[Dict]:
+        """调用7z列出文件并选出最小的测试文件 - 边读取输出边解析，找到理想候选即提前结束"""
+        # -slt: 技术信息模式；-sccUTF-8: 控制台输出使用UTF-8，否则中文Windows上为系统代码页
+        cmd = [self.sevenzip_path, "l", "-slt", "-sccUTF-8", archive_path]
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=1 << 16,
+                encoding="utf-8",
+                errors="replace",
+                startupinfo=_hidden_startupinfo(),
+                creationflags=_NO_WINDOW_FLAGS,
+            )
+        except OSError as e:
+            print(f"获取文件列表失败: {str(e)}")
+            return None
+        self._job.assign(process)
 
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.CalledProcessError,
-            Exception,
-        ) as e:
+        # 流式读取无法使用communicate的超时，由定时器在超时后终止子进程
+        timer = threading.Timer(self.LIST_TIMEOUT, process.kill)
+        timer.start()
+        try:
+            smallest_file = self._parse_file_list_for_smallest(process.stdout)
+            if self._is_ideal_test_file(smallest_file):
+                # 已找到理想候选，其余条目无需列出
+                process.kill()
+                return smallest_file
+            process.wait()
+        except Exception as e:
             print(f"获取文件列表失败: {str(e)}")
+            process.kill()
             return None
+        finally:
+            timer.cancel()
+            process.stdout.close()
+            process.wait()
 
-    def _parse_file_list_for_smallest(self, list_output: str) -> Optional[Dict]:
-        """解析7z列表输出，找到最小的非目录文件"""
-        files = []
-        current_file = {}
+        if process.returncode != 0:
+            return None
+        return smallest_file
+
+    def _is_ideal_test_file(self, file_info: Optional[Dict]) -> bool:
+        """目录层级浅且足够小的文件已是理想测试目标，无需继续查找"""
+        return (
+            file_info is not None
+            and file_info["depth"] <= self.IDEAL_TEST_FILE_DEPTH
+            and file_info["size"] <= self.IDEAL_TEST_FILE_SIZE
+        )
 
-        lines = list_output.split("\n")
+    def _parse_file_list_for_smallest(self, lines: Iterable[str]) -> Optional[Dict]:
+        """逐行解析7z -slt 列表输出，找到最小的非目录文件 - 解析和择优同时完成
+
+        出现理想候选（见_is_ideal_test_file）时立即停止读取。
+        """
+        best_file = None
+        best_key = None
+        candidate_count = 0
+
+        def consider(file_info: Dict) -> bool:
+            nonlocal best_file, best_key, candidate_count
+            if not self._is_valid_test_file(file_info):
+                return False
+            candidate_count += 1
+            # 优先选择目录层级浅且文件小的 - 避免Unicode路径匹配问题
+            name = file_info["name"]
+            file_info["depth"] = name.count("\\") + name.count("/")
+            key = (file_info["depth"], file_info.get("size", 0))
+            # 理想候选直接选用，不必再与之前的候选比较
+            ideal = self._is_ideal_test_file(file_info)
+            if ideal or best_key is None or key < best_key:
+                best_file, best_key = file_info, key
+            return ideal
+
+        # 每行只需一次正则匹配，Python只处理每条记录中需要的四个字段
+        match_field = self.SLT_FIELD_PATTERN.match
+        current_file = {}
         for line in lines:
-            line = line.strip()
-
-            if line.startswith("Path = "):
+            if line.isspace():
+                # 空行结束一条记录，立即择优以便尽早停止读取
+                if current_file:
+                    found = consider(current_file)
+                    current_file = {}
+                    if found:
+                        break
+                continue
+
+            match = match_field(line)
+            if match is None:
+                continue
+            size, field, value = match.group("size", "field", "value")
+
+            if size is not None:
+                current_file["size"] = int(size)
+
+            elif field == "Path":
                 # 保存上一个文件（如果有的话）
-                if current_file and self._is_valid_test_file(current_file):
-                    files.append(current_file.copy())
+                if current_file and consider(current_file):
+                    current_file = {}
+                    break
 
                 # 开始新文件
-                current_file = {"name": line[7:]}  # 移除 "Path = "
+                current_file = {"name": value}
 
-            elif line.startswith("Size = "):
-                try:
-                    current_file["size"] = int(line[7:])
-                except ValueError:
-                    current_file["size"] = 0
+            elif field == "Attributes":
+                current_file["attributes"] = value
 
-            elif line.startswith("Attributes = "):
-                current_file["attributes"] = line[13:]
-
-            elif line.startswith("Encrypted = "):
-                current_file["encrypted"] = line[12:].strip() == "+"
+            else:
+                current_file["encrypted"] = value == "+"
 
         # 处理最后一个文件
-        if current_file and self._is_valid_test_file(current_file):
-            files.append(current_file)
+        if current_file:
+            consider(current_file)
 
-        if not files:
+        if best_file is None:
             return None
 
-        # 优先选择目录层级浅且文件小的 - 避免Unicode路径匹配问题
-        def get_file_priority(f):
-            name = f.get("name", "")
-            size = f.get("size", float("inf"))
-            # 计算目录层级深度（反斜杠数量）
-            depth = name.count("\\") + name.count("/")
-            # 优先级：目录深度权重更高，然后是文件大小
-            return (depth, size)
-
-        files.sort(key=get_file_priority)
-        best_file = files[0]
-
-        depth = best_file.get("name", "").count("\\") + best_file.get("name", "").count(
-            "/"
-        )
         print(
-            f"找到 {len(files)} 个候选文件，选择层级最浅的: {best_file['name']} (深度:{depth}, 大小:{best_file.get('size', 0)} bytes)"
+            f"找到 {candidate_count} 个候选文件，选择层级最浅的: {best_file['name']} (深度:{best_key[0]}, 大小:{best_key[1]} bytes)"
         )
         return best_file
 
@@ -320,35 +1019,24 @@ class UnifiedArchiveHandler:
         if size <= 0:
             return False
 
-        # 优先选择常见的小文件类型
+        # 优先选择常见的小文件类型 - 取一次扩展名做集合查找
         name_lower = name.lower()
-        preferred_extensions = [
-            ".txt",
-            ".jpg",
-            ".png",
-            ".gif",
-            ".pdf",
-            ".doc",
-            ".xml",
-            ".json",
-            ".ini",
-        ]
-
-        # 如果是首选类型，给予额外权重（通过调整size实现）
-        if any(name_lower.endswith(ext) for ext in preferred_extensions):
-            file_info["priority"] = True
-        else:
-            file_info["priority"] = False
+        dot = name_lower.rfind(".")
+        file_info["priority"] = (
+            dot >= 0 and name_lower[dot:] in self.PREFERRED_TEST_EXTENSIONS
+        )
 
         return True
 
-    def extract_info(self, archive_path: str) -> Dict:
-        """获取压缩文件信息"""
-        if not os.path.exists(archive_path):
-            return {"error": "文件不存在"}
+    def extract_info(self, archive_path: str, file_size: Optional[int] = None) -> Dict:
+        """获取压缩文件信息，调用方已知文件大小时可传入以省去stat"""
+        if file_size is None:
+            try:
+                file_size = os.stat(archive_path).st_size
+            except OSError:
+                return {"error": "文件不存在"}
 
         try:
-            file_size = os.path.getsize(archive_path)
             archive_type = self.detect_archive_type(archive_path)
 
             # 对于分卷文件，提供基本信息避免超时
@@ -369,12 +1057,30 @@ class UnifiedArchiveHandler:
         except Exception as e:
             return {"error": f"获取文件信息失败: {str(e)}"}
 
+    def has_password(self, archive_path: str) -> bool:
+        """判断压缩包是否加密 - 读到第一个加密标记即返回，不统计完整信息"""
+        archive_type = self.detect_archive_type(archive_path)
+        try:
+            if archive_type == ".zip" and not self._is_volume_file(archive_path):
+                with zipfile.ZipFile(archive_path) as zip_file:
+                    for info in zip_file.infolist():
+                        if info.flag_bits & 0x1:
+                            return True
+                return False
+            if archive_type == ".7z" and not self._is_volume_file(archive_path):
+                if crypto_kernel.read_7z_aes_params(archive_path) is not None:
+                    return True
+            elif archive_type == ".rar":
+                if crypto_kernel.read_rar_crypto_params(archive_path) is not None:
+                    return True
+        except Exception as e:
+            print(f"快速加密检测失败，使用完整检测: {str(e)}")
+
+        return self.extract_info(archive_path).get("has_password", False)
+
     def _is_volume_file(self, archive_path: str) -> bool:
         """检查是否为分卷文件"""
-        filename = archive_path.lower()
-        return any(
-            pattern.search(filename) for pattern, _ in self.VOLUME_PATTERNS.values()
-        )
+        return self.VOLUME_PATTERN.search(archive_path) is not None
 
     def _get_detailed_info(
         self, archive_path: str, file_size: int, archive_type: str
@@ -401,18 +1107,13 @@ class UnifiedArchiveHandler:
         file_count = 0
         has_password = False
 
-        lines = output.split("\n")
-        for line in lines:
-            # 查找文件数量
-            if "files" in line.lower():
-                files_match = re.search(r"(\d+)\s+files?", line, re.IGNORECASE)
-                if files_match:
-                    file_count = int(files_match.group(1))
-
-            # 检查是否有密码保护
-            if any(
-                keyword in line.lower() for keyword in ["encrypted", "aes", "method"]
-            ):
+        for match in self.INFO_PATTERN.finditer(output):
+            files = match.group("files")
+            if files is not None:
+                # 以最后出现的数量（汇总行）为准
+                file_count = int(files)
+            else:
+                # 检查是否有密码保护
                 has_password = True
 
         return {
@@ -437,11 +1138,112 @@ class UnifiedArchiveHandler:
         }
 
 
+# 尚未计算的缓存值
+_UNSET = object()
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_archive_type(file_path: str) -> Optional[str]:
+    """按扩展名查表检测类型，仅 .7z.NNN 分卷需要正则
+
+    只看文件名，不访问文件系统，按路径缓存不会过期。
+    """
+    handler = UnifiedArchiveHandler
+    filename = os.path.basename(file_path).lower()
+    stem, dot, tail = filename.rpartition(".")
+    if not dot:
+        return None
+
+    # 标准格式（含 .partN.rar 分卷）
+    ext = "." + tail
+    if ext in handler.SUPPORTED_FORMATS:
+        return ext
+
+    # ZIP/RAR分卷：.z01 / .r00
+    if len(tail) == 3 and tail[1:].isdigit() and tail[0] in handler.VOLUME_TAIL_FORMATS:
+        return handler.VOLUME_TAIL_FORMATS[tail[0]]
+
+    # 7Z分卷：.7z.001
+    if len(tail) == 3 and tail.isdigit() and stem.endswith(".7z"):
+        pattern, format_ext = handler.VOLUME_PATTERNS["7z_volume"]
+        if pattern.search(filename):
+            return format_ext
+
+    return None
+
+
+class ArchiveSession:
+    """破解会话 - 打开时解析一次第一卷路径和测试函数，每次猜测直接调用
+
+    破解过程中压缩包不变，分卷查找、文件存在检查和格式分派都无需在每次猜测时重复。
+    """
+
+    def __init__(self, handler: UnifiedArchiveHandler, archive_path: str):
+        self.archive_path = archive_path
+        self._archive = handler.bind_archive(archive_path)
+        self.first_volume_path = self._archive.path
+        # 打开时校验一次，损坏的压缩包直接失败，不必每次猜测都失败一遍
+        handler.validate_archive(self.first_volume_path)
+
+        self._handler = handler
+        self._zipcrypto_verifier = _UNSET
+        # 测试UTF-8编码的密码：格式对应的测试函数预先绑定压缩包，
+        # 每次猜测直接进入格式实现，不再经过会话方法转发
+        self.try_password_bytes: Callable[[bytes], bool] = functools.partial(
+            self._archive.test_fn, self._archive
+        )
+
+    def try_password(self, password: str) -> bool:
+        """测试密码"""
+        return self.try_password_bytes(password.encode("utf-8"))
+
+    def zipcrypto_verifier(self) -> Optional[tuple]:
+        """ZIP传统加密预检数据，供批量预检；非ZIP传统加密时返回None"""
+        if self._zipcrypto_verifier is _UNSET:
+            self._zipcrypto_verifier = self._handler.get_zipcrypto_verifier(
+                self.first_volume_path
+            )
+        return self._zipcrypto_verifier
+
+    def candidate_indices(self, passwords: List[bytes]) -> Optional[Iterable[int]]:
+        """在CPU上批量预检一批密码，返回可能正确的密码下标
+
+        只有ZIP传统加密且安装了numba时可用，否则返回None，调用者应逐个测试。
+        """
+        verifier = self.zipcrypto_verifier()
+        if verifier is None or not passwords:
+            return None
+        kernels = _load_cpu_kernels()
+        if kernels is None:
+            return None
+        return kernels.find_pkzip_candidates(passwords, *verifier)
+
+    def close(self) -> None:
+        """释放会话期间缓存的压缩包解析结果"""
+        self._handler.close_archive(self.first_volume_path)
+
+    def __enter__(self) -> "ArchiveSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
 class ArchiveManager:
     """压缩文件管理器 - 简化版"""
 
+    # 压缩文件信息缓存的最大条目数
+    INFO_CACHE_SIZE = 64
+
     def __init__(self):
         self.handler = UnifiedArchiveHandler()
+        # (路径, 修改时间, 大小) -> 压缩文件信息，按最近使用顺序排列
+        self._info_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+
+        # 批量测试工作池，首次批量测试时创建，跨批次复用
+        self._batch_executor = None
+        self._batch_executor_key = None
+        self._batch_found_event = None
 
     @property
     def supported_formats(self) -> List[str]:
@@ -452,20 +1254,289 @@ class ArchiveManager:
         """检查文件格式是否支持"""
         return self.handler.is_supported(file_path)
 
+    def classify(self, file_path: str) -> Dict:
+        """一次得到文件的格式和分卷信息（只看文件名，不读取内容）
+
+        Returns:
+            {"supported": 是否支持, "type": 格式扩展名或None,
+             "first_volume": 第一卷路径（非分卷时为原路径）, "is_volume": 是否为分卷中的非首卷}
+        """
+        archive_type = self.handler.detect_archive_type(file_path)
+        first_volume = (
+            self.handler.find_first_volume(file_path) if archive_type else file_path
+        )
+        return {
+            "supported": archive_type is not None,
+            "type": archive_type,
+            "first_volume": first_volume,
+            "is_volume": first_volume != file_path,
+        }
+
     def test_password(self, archive_path: str, password: str) -> bool:
         """测试压缩文件密码"""
         # 对于分卷压缩包，使用第一卷进行测试
         first_volume_path = self.handler.find_first_volume(archive_path)
         return self.handler.test_password(first_volume_path, password)
 
+    def test_password_bytes(self, archive_path: str, pw_bytes: bytes) -> bool:
+        """测试UTF-8编码的压缩文件密码"""
+        first_volume_path = self.handler.find_first_volume(archive_path)
+        return self.handler.test_password_bytes(first_volume_path, pw_bytes)
+
+    def open_session(self, archive_path: str) -> ArchiveSession:
+        """打开破解会话，文件不存在时抛出ArchiveError，无法识别时抛出CorruptArchiveError"""
+        return ArchiveSession(self.handler, archive_path)
+
+    def test_password_batch(
+        self,
+        archive_path: str,
+        passwords: List[Union[str, bytes]],
+        max_workers: Optional[int] = None,
+        use_threads: bool = False,
+    ) -> Optional[int]:
+        """并行测试一批密码（str或UTF-8字节串），返回第一个命中密码的下标，未命中返回None
+
+        密码列表被切分为连续的分片，每个工作者在本地循环测试，不做逐个密码的进程间通信。
+        ZIP传统加密预检是纯Python计算，会持有GIL，因此默认使用多进程；
+        只依赖7z子进程的场景可以使用线程版本(use_threads=True)以省去进程启动开销。
+        """
+        if not passwords or not os.path.exists(
+            self.handler.find_first_volume(archive_path)
+        ):
+            return None
+
+        pool_size = max(1, max_workers or os.cpu_count() or 1)
+        executor, found_event = self._get_batch_executor(use_threads, pool_size)
+        found_event.clear()
+
+        shard_count = min(pool_size, len(passwords))
+        shard_size = (len(passwords) + shard_count - 1) // shard_count
+        shards = [
+            (passwords[start : start + shard_size], start)
+            for start in range(0, len(passwords), shard_size)
+        ]
+
+        futures = [
+            self._submit_shard(executor, use_threads, archive_path, shard, offset)
+            for shard, offset in shards
+        ]
+        hits = [f.result() for f in futures]
+
+        hits = [hit for hit in hits if hit is not None]
+        return min(hits) if hits else None
+
+    def test_passwords_batch(
+        self,
+        archive_path: str,
+        passwords: List[str],
+        max_workers: Optional[int] = None,
+        use_threads: bool = False,
+    ) -> Optional[str]:
+        """并行测试一批密码，返回命中的密码，未命中返回None"""
+        index = self.test_password_batch(archive_path, passwords, max_workers, use_threads)
+        return None if index is None else passwords[index]
+
+    def test_passwords_parallel(
+        self,
+        archive_path: str,
+        passwords: Iterable[str],
+        max_workers: Optional[int] = None,
+        batch_size: int = 1000,
+        use_threads: bool = False,
+    ) -> Optional[str]:
+        """并行测试密码流，返回命中的密码，未命中返回None
+
+        密码按batch_size分块提交给工作池，在途块数不超过工作者数的两倍，
+        字典无需整体读入内存；任一块命中后通知其余块在下一次猜测前退出。
+        """
+        if not os.path.exists(self.handler.find_first_volume(archive_path)):
+            return None
+
+        pool_size = max(1, max_workers or os.cpu_count() or 1)
+        executor, found_event = self._get_batch_executor(use_threads, pool_size)
+        found_event.clear()
+
+        password_iter = iter(passwords)
+        pending = {}
+        try:
+            while True:
+                while len(pending) < pool_size * 2:
+                    chunk = list(itertools.islice(password_iter, batch_size))
+                    if not chunk:
+                        break
+                    future = self._submit_shard(
+                        executor, use_threads, archive_path, chunk, 0
+                    )
+                    pending[future] = chunk
+
+                if not pending:
+                    return None
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    index = future.result()
+                    if index is not None:
+                        return chunk[index]
+        finally:
+            if pending:
+                # 让仍在运行的块尽快退出，并等待其结束，避免与下一次调用重叠
+                found_event.set()
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+
+    def _submit_shard(
+        self, executor, use_threads: bool, archive_path: str, shard: List[str], offset: int
+    ) -> Future:
+        """向工作池提交一段密码"""
+        if use_threads:
+            return executor.submit(
+                _run_password_shard,
+                self.open_session(archive_path),
+                self._batch_found_event,
+                shard,
+                offset,
+            )
+        # 整段密码以换行连接为一个字节串传给工作进程，序列化一个对象而不是成千上万个小对象；
+        # 个别密码本身含换行时无法无歧义拆分，按原列表传递
+        packed = b"\n".join(
+            password if isinstance(password, bytes) else password.encode("utf-8")
+            for password in shard
+        )
+        if packed.count(b"\n") == len(shard) - 1:
+            return executor.submit(_test_password_shard, archive_path, packed, offset)
+        return executor.submit(_test_password_shard, archive_path, shard, offset)
+
+    def _get_batch_executor(self, use_threads: bool, pool_size: int):
+        """获取批量测试的工作池 - 跨批次复用，避免每批都重新启动进程
+
+        工作进程中的ArchiveManager会保留已解析的加密头，后续批次无需重新解析。
+        """
+        key = (use_threads, pool_size)
+        if self._batch_executor is not None and self._batch_executor_key == key:
+            return self._batch_executor, self._batch_found_event
+
+        self.shutdown_batch_workers()
+        if use_threads:
+            found_event = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=pool_size)
+        else:
+            mp_context = multiprocessing.get_context("spawn")
+            found_event = mp_context.Event()
+            executor = ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=mp_context,
+                initializer=_init_batch_worker,
+                initargs=(found_event,),
+            )
+
+        self._batch_executor = executor
+        self._batch_executor_key = key
+        self._batch_found_event = found_event
+        return executor, found_event
+
+    def shutdown_batch_workers(self) -> None:
+        """关闭批量测试的工作池"""
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True, cancel_futures=True)
+            self._batch_executor = None
+            self._batch_executor_key = None
+            self._batch_found_event = None
+
+    @staticmethod
+    def iter_password_batches(
+        dict_path: str,
+        batch_size: int = 4096,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Iterator[List[bytes]]:
+        """内存映射读取字典，逐批产出UTF-8编码的密码（可直接交给test_password_bytes）
+
+        start/end为字节范围，用于多个工作者各自读取字典的一段：
+        一行属于其起始位置所在的范围，跨越end的行由当前范围读完。
+        """
+        with open(dict_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空文件无法映射
+                return
+
+            with mm:
+                # 提示内核顺序预读，测试当前批次时下一批已在页缓存中
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                elif hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+
+                size = len(mm)
+                end = size if end is None else min(end, size)
+                pos = start
+                if pos > 0:
+                    # 跳过属于上一个范围的半行
+                    newline = mm.find(b"\n", pos - 1)
+                    pos = size if newline == -1 else newline + 1
+
+                batch = []
+                while pos < end:
+                    newline = mm.find(b"\n", pos)
+                    if newline == -1:
+                        newline = size
+                    password = mm[pos:newline].strip()
+                    pos = newline + 1
+                    if password:
+                        batch.append(password)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+
+                if batch:
+                    yield batch
+
+    def has_password(self, archive_path: str) -> bool:
+        """判断压缩文件是否需要密码"""
+        first_volume_path = self.handler.find_first_volume(archive_path)
+        return self.handler.has_password(first_volume_path)
+
+    def close_archive(self, archive_path: str) -> None:
+        """释放压缩包在破解过程中缓存的解析结果"""
+        first_volume_path = self.handler.find_first_volume(archive_path)
+        self.handler.close_archive(first_volume_path)
+
     def get_archive_info(self, archive_path: str) -> Dict:
-        """获取压缩文件信息"""
+        """获取压缩文件信息 - 文件未修改时直接返回缓存结果"""
+        try:
+            stat = os.stat(archive_path)
+        except OSError:
+            return {"error": "文件不存在"}
+
+        key = (archive_path, stat.st_mtime_ns, stat.st_size)
+        info = self._info_cache.get(key)
+        if info is None:
+            info = self._get_archive_info(archive_path, stat.st_size)
+            self._info_cache[key] = info
+            if len(self._info_cache) > self.INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+        else:
+            self._info_cache.move_to_end(key)
+
+        # 返回副本，避免调用方修改污染缓存
+        return dict(info)
+
+    def _get_archive_info(self, archive_path: str, file_size: int) -> Dict:
+        """读取压缩文件信息，file_size为调用方已stat得到的当前文件大小"""
         # 对于分卷压缩包，使用第一卷获取信息
-        first_volume_path = self.handler.find_first_volume(archive_path)
-        info = self.handler.extract_info(first_volume_path)
+        classified = self.classify(archive_path)
+        first_volume_path = classified["first_volume"]
+        if not classified["is_volume"]:
+            info = self.handler.extract_info(first_volume_path, file_size)
+        else:
+            info = self.handler.extract_info(first_volume_path)
 
         # 添加分卷信息
-        if first_volume_path != archive_path:
+        if classified["is_volume"]:
             info["is_volume"] = True
             info["first_volume"] = first_volume_path
             info["current_volume"] = archive_path
@@ -473,8 +1544,7 @@ class ArchiveManager:
             info["is_volume"] = False
 
         # 添加当前文件的大小信息
-        if os.path.exists(archive_path):
-            info["file_size"] = os.path.getsize(archive_path)
+        info["file_size"] = file_size
 
         return info
 
@@ -6,10 +6,22 @@ import os
 import json
 from typing import Dict, Any, Optional
 
+try:
+    import orjson  # 可选：C实现的JSON解析，启动更快
+except ImportError:
+    orjson = None
+
+
+# 已解析的配置文件，键为 (绝对路径, 修改时间, 大小)，同一进程内多次创建Config时复用
+_parsed_config_cache: Dict[tuple, Dict[str, Any]] = {}
+
 
 class Config:
     """应用程序配置管理类 - 简化版"""
 
+    # 标记修改后延迟保存的时间（毫秒），期间的多次修改只写一次文件
+    SAVE_DELAY_MS = 200
+
     def __init__(self):
         self.config_file = "config.json"
         self.default_config = {
@@ -21,9 +33,18 @@ class Config:
             "last_archive_path": "",
             "save_log": True,
             "log_directory": "logs",
+            "max_log_lines": 5000,  # 界面日志区最多保留的行数
+            "dictionary_count_cache": {},  # 字典路径 -> [修改时间, 大小, 密码数量]，避免重复统计
             "batch_size": 1000,  # GPU批处理大小
+            "preferred_accelerator": "",  # 指定GPU加速库（如"Numba-CUDA"），为空时自动探测
+            "dedupe_passwords": False,  # 跳过字典中重复的密码（布隆过滤器，适合合并的大字典）
+            "use_multiprocess": True,  # CPU模式下使用多进程并行测试
+            "max_processes": os.cpu_count() or 1,  # 并行测试的进程数
         }
         self.config = self.default_config.copy()
+        # 有尚未写入文件的修改；是否已安排延迟保存
+        self._dirty = False
+        self._save_scheduled = False
         self.load_config()
     
     # 支持字典式访问
@@ -38,32 +59,101 @@ class Config:
     def load_config(self) -> None:
         """加载配置文件"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    loaded_config = json.load(f)
-                    self.config.update(loaded_config)
+            stat = os.stat(self.config_file)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"加载配置文件失败: {e}")
+            return
+
+        key = (os.path.abspath(self.config_file), stat.st_mtime_ns, stat.st_size)
+        try:
+            loaded_config = _parsed_config_cache.get(key)
+            if loaded_config is None:
+                with open(self.config_file, "rb") as f:
+                    data = f.read()
+                if orjson is not None:
+                    loaded_config = orjson.loads(data)
+                else:
+                    loaded_config = json.loads(data.decode("utf-8"))
+                _parsed_config_cache[key] = loaded_config
+            # 缓存的解析结果由多个实例共享，只合并到各自的配置中，不直接修改
+            self.config.update(loaded_config)
         except Exception as e:
             print(f"加载配置文件失败: {e}")
 
     def save_config(self) -> None:
         """保存配置文件"""
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.config, indent=4, ensure_ascii=False).encode(
+                    "utf-8"
+                )
+            # 先写临时文件再替换，写入中途退出也不会留下不完整的配置文件
+            temp_file = f"{self.config_file}.tmp"
+            with open(temp_file, "wb") as f:
+                f.write(data)
+            os.replace(temp_file, self.config_file)
+            self._dirty = False
         except Exception as e:
             print(f"保存配置文件失败: {e}")
 
+    def mark_dirty(self) -> None:
+        """标记配置已修改，稍后在Qt事件循环中保存一次；没有事件循环时立即保存"""
+        self._dirty = True
+        if self._save_scheduled:
+            return
+        try:
+            from PySide6.QtCore import QCoreApplication, QTimer
+        except ImportError:
+            QCoreApplication = None
+        if QCoreApplication is None or QCoreApplication.instance() is None:
+            self.flush_if_dirty()
+            return
+        self._save_scheduled = True
+        QTimer.singleShot(self.SAVE_DELAY_MS, self.flush_if_dirty)
+
+    def flush_if_dirty(self) -> None:
+        """立即写入尚未保存的修改（例如程序退出前）"""
+        self._save_scheduled = False
+        if self._dirty:
+            self.save_config()
+
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置项"""
         return self.config.get(key, default)
 
-    def set(self, key: str, value: Any) -> None:
-        """设置配置项"""
+    def get_many(self, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """一次读取多个配置项，defaults为 {配置项: 默认值}"""
+        config = self.config
+        return {key: config.get(key, default) for key, default in defaults.items()}
+
+    def set(self, key: str, value: Any) -> bool:
+        """设置配置项，值有变化时返回True"""
+        if key in self.config and self.config[key] == value:
+            return False
         self.config[key] = value
+        return True
+
+    def update(self, updates: Dict[str, Any], persist: bool = False) -> bool:
+        """批量更新配置 - 一次合并所有有变化的项；默认只修改内存，persist为True时保存一次文件
 
-    def update(self, updates: Dict[str, Any]) -> None:
-        """批量更新配置"""
-        self.config.update(updates)
+        Returns:
+            是否有配置项发生变化（没有变化时不保存）
+        """
+        changed = {
+            key: value
+            for key, value in updates.items()
+            if key not in self.config or self.config[key] != value
+        }
+        if not changed:
+            return False
+        self.config.update(changed)
+        if persist:
+            self.save_config()
+        return True
 
     def reset_to_default(self) -> None:
         """重置为默认配置"""
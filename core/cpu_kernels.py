@@ -0,0 +1,111 @@
+"""
+CPU密码校验内核 - 基于Numba JIT编译
+只在批量预检时按需导入，缺少numba/numpy时导入失败由调用方处理。
+"""
+
+from typing import List
+
+import numpy as np
+from numba import njit
+
+from .crypto_kernel import _CRC_TABLE, verify_pkzip_headers
+
+_CRC_TABLE_ARRAY = np.array(_CRC_TABLE, dtype=np.int64)
+# 密码矩阵的最大宽度（字节），更长的密码逐个在标量路径上校验，避免单行超长的字典撑大矩阵
+MAX_PASSWORD_WIDTH = 64
+
+
+@njit(cache=True)
+def _pkzip_check_batch(passwords, lengths, enc_headers, check_bytes, member_count, crc_table, flags):
+    """逐行校验密码矩阵的ZipCrypto校验字节，与crypto_kernel.verify_pkzip_headers相同
+
+    非ASCII密码在ZIP中的编码不确定，直接标记为候选。
+    """
+    for i in range(passwords.shape[0]):
+        key0 = np.int64(305419896)
+        key1 = np.int64(591751049)
+        key2 = np.int64(878082192)
+        ascii_only = True
+        for j in range(lengths[i]):
+            c = np.int64(passwords[i, j])
+            if c >= 0x80:
+                ascii_only = False
+                break
+            key0 = (key0 >> 8) ^ crc_table[(key0 ^ c) & 0xFF]
+            key1 = (key1 + (key0 & 0xFF)) & 0xFFFFFFFF
+            key1 = (key1 * 134775813 + 1) & 0xFFFFFFFF
+            key2 = (key2 >> 8) ^ crc_table[(key2 ^ (key1 >> 24)) & 0xFF]
+        if not ascii_only:
+            flags[i] = 1
+            continue
+
+        passed = True
+        for m in range(member_count):
+            k0 = key0
+            k1 = key1
+            k2 = key2
+            c = np.int64(0)
+            for j in range(12):
+                k = (k2 | 2) & 0xFFFF
+                c = np.int64(enc_headers[m * 12 + j]) ^ (((k * (k ^ 1)) >> 8) & 0xFF)
+                k0 = (k0 >> 8) ^ crc_table[(k0 ^ c) & 0xFF]
+                k1 = (k1 + (k0 & 0xFF)) & 0xFFFFFFFF
+                k1 = (k1 * 134775813 + 1) & 0xFFFFFFFF
+                k2 = (k2 >> 8) ^ crc_table[(k2 ^ (k1 >> 24)) & 0xFF]
+            if c != check_bytes[m]:
+                passed = False
+                break
+        flags[i] = 1 if passed else 0
+
+
+def find_pkzip_candidates(
+    passwords: List[bytes], enc_headers: bytes, check_bytes: bytes, member_count: int
+) -> np.ndarray:
+    """返回一批密码中通过ZipCrypto校验字节检查的下标（升序）
+
+    超过MAX_PASSWORD_WIDTH字节的密码不放入矩阵，逐个用verify_pkzip_headers校验。
+    """
+    width = max(max(map(len, passwords), default=0), 1)
+    if width <= MAX_PASSWORD_WIDTH:
+        return _find_candidates_in_matrix(passwords, width, enc_headers, check_bytes, member_count)
+
+    fitting = [i for i, password in enumerate(passwords) if len(password) <= MAX_PASSWORD_WIDTH]
+    candidates = []
+    if fitting:
+        found = _find_candidates_in_matrix(
+            [passwords[i] for i in fitting], MAX_PASSWORD_WIDTH, enc_headers, check_bytes, member_count
+        )
+        candidates.extend(fitting[i] for i in found)
+    # 与内核一致：非ASCII密码在ZIP中的编码不确定，直接作为候选
+    candidates.extend(
+        i
+        for i, password in enumerate(passwords)
+        if len(password) > MAX_PASSWORD_WIDTH
+        and (
+            not password.isascii()
+            or verify_pkzip_headers(password, enc_headers, check_bytes, member_count)
+        )
+    )
+    return np.array(sorted(candidates), dtype=np.int64)
+
+
+def _find_candidates_in_matrix(
+    passwords: List[bytes], width: int, enc_headers: bytes, check_bytes: bytes, member_count: int
+) -> np.ndarray:
+    """把不超过width字节的密码排成矩阵，在JIT内核中批量校验"""
+    count = len(passwords)
+    buf = np.frombuffer(
+        b"".join(password.ljust(width, b"\0") for password in passwords), dtype=np.uint8
+    ).reshape(count, width)
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=count)
+    flags = np.zeros(count, dtype=np.uint8)
+    _pkzip_check_batch(
+        buf,
+        lengths,
+        np.frombuffer(enc_headers, dtype=np.uint8),
+        np.frombuffer(check_bytes, dtype=np.uint8),
+        member_count,
+        _CRC_TABLE_ARRAY,
+        flags,
+    )
+    return np.flatnonzero(flags)
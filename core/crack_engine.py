@@ -2,12 +2,15 @@
 密码破解引擎
 """
 
+import gc
+import os
+import statistics
 import time
 import threading
-from typing import Optional, Callable, Dict, Any
-from PySide6.QtCore import QObject, Signal, QThread
-from .archive_handler import ArchiveManager
-from .dictionary import DictionaryReader
+from typing import Optional, Callable, Dict, Any, Tuple
+from PySide6.QtCore import QObject, Qt, Signal, QThread, QTimer
+from .archive_handler import ArchiveManager, ArchiveSession
+from .dictionary import DictionaryManager, DictionaryReader
 from .gpu_accelerator import GPUManager
 from .logger import Logger
 
@@ -27,11 +30,13 @@ class PasswordCrackResult:
 class PasswordCrackWorker(QThread):
     """密码破解工作线程"""
 
-    # 信号定义
-    progress_updated = Signal(int, int, str)  # 当前进度, 总数, 当前密码
+    # 信号定义 - 进度不发信号，由引擎在主线程中定时读取progress_snapshot
     password_found = Signal(str, int, float)  # 找到的密码, 尝试次数, 耗时
     crack_finished = Signal(bool, str)  # 是否成功, 错误信息
-    speed_updated = Signal(float)  # 测试速度 (passwords/second)
+
+    # 多进程模式下每批的目标耗时（秒）及批大小上限，批大小按实测的单次猜测耗时换算
+    TARGET_BATCH_SECONDS = 2.0
+    MAX_BATCH_SIZE = 65536
 
     def __init__(self, archive_path: str, dictionary_path: str, config: Dict[str, Any]):
         super().__init__()
@@ -39,24 +44,32 @@ class PasswordCrackWorker(QThread):
         self.dictionary_path = dictionary_path
         self.config = config
         self.archive_manager = ArchiveManager()
-        self.gpu_manager = GPUManager()
+        self.gpu_manager = GPUManager(preferred=config.get("preferred_accelerator") or None)
         self.logger = Logger()
 
         self.is_running = False
         self.is_paused = False
+        # 未暂停时保持置位；暂停时清除，破解循环阻塞等待
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self.result = PasswordCrackResult()
 
-        # 性能统计
+        # 性能统计 - 已测试的密码数和最新进度由引擎在主线程中定时采样
         self.start_time = 0
-        self.last_speed_update = 0
-        self.speed_counter = 0
+        self.tested_count = 0
+        # 最新进度 (当前进度, 总数, 当前密码字节串)，整体替换，读取方无需加锁
+        self.progress_snapshot: Optional[Tuple[int, int, bytes]] = None
+        # 常见密码测试时实测的单次猜测耗时中位数（秒），None表示尚未测量
+        self.guess_latency: Optional[float] = None
+        # 遍历字典前已测试的常见密码数，计入尝试次数和进度
+        self.common_attempts = 0
 
     def run(self):
         """运行密码破解"""
         self.is_running = True
         self.start_time = time.time()
-        self.last_speed_update = self.start_time
-        self.speed_counter = 0
+        self.tested_count = 0
+        gc_frozen = False
 
         try:
             # 验证文件
@@ -65,7 +78,9 @@ class PasswordCrackWorker(QThread):
                 return
 
             # 初始化字典读取器
-            dictionary_reader = DictionaryReader(self.dictionary_path)
+            dictionary_reader = DictionaryReader(
+                self.dictionary_path, dedupe=self.config.get("dedupe_passwords", False)
+            )
             total_passwords = dictionary_reader.get_total_passwords()
 
             if total_passwords == 0:
@@ -77,50 +92,145 @@ class PasswordCrackWorker(QThread):
                 f"字典文件: {self.dictionary_path} (共 {total_passwords} 个密码)"
             )
 
-            # 选择处理模式
-            use_gpu = (
-                self.config.get("gpu_acceleration", False)
-                and self.gpu_manager.is_gpu_available()
-            )
-            batch_size = self.config.get("batch_size", 1000) if use_gpu else 1
+            # 循环GC对整个进程生效，不能在GUI进程中关闭；把已有对象移入永久代，
+            # 破解期间的回收只扫描新对象，结束后恢复（工作进程中另行关闭GC）
+            gc.freeze()
+            gc_frozen = True
 
-            if use_gpu:
-                self.logger.log("使用GPU加速模式")
-                self._crack_with_gpu(dictionary_reader, total_passwords)
-            else:
-                self.logger.log("使用CPU模式")
-                self._crack_with_cpu(dictionary_reader, total_passwords)
+            # 会话只解析一次压缩包，之后每次猜测只做密码校验
+            with self.archive_manager.open_session(self.archive_path) as session:
+                # 大多数压缩包密码都在常见密码中，先单独测试，并从字典中排除它们
+                if self._try_common_passwords(session, total_passwords):
+                    return
+                total_passwords += self.common_attempts
+                dictionary_reader.exclude = DictionaryManager.COMMON_PASSWORD_BYTES
+
+                # 选择处理模式 - GPU目前只能预检ZIP传统加密
+                use_gpu = (
+                    self.config.get("gpu_acceleration", False)
+                    and self.gpu_manager.is_gpu_available()
+                    and self.gpu_manager.has_implementation(session.zipcrypto_verifier())
+                )
+
+                if use_gpu:
+                    self.logger.log("使用GPU加速模式")
+                    self._crack_with_gpu(dictionary_reader, total_passwords, session)
+                else:
+                    self.logger.log("使用CPU模式")
+                    self._crack_with_cpu(dictionary_reader, total_passwords, session)
 
         except Exception as e:
             self.logger.log(f"破解过程中发生错误: {str(e)}")
             self.crack_finished.emit(False, f"破解过程中发生错误: {str(e)}")
         finally:
+            if gc_frozen:
+                gc.unfreeze()
             self.is_running = False
+            self.archive_manager.shutdown_batch_workers()
+            self.archive_manager.close_archive(self.archive_path)
+            # 本次破解的日志写入文件
+            self.logger.flush()
 
     def _crack_with_cpu(
-        self, dictionary_reader: DictionaryReader, total_passwords: int
+        self,
+        dictionary_reader: DictionaryReader,
+        total_passwords: int,
+        session: ArchiveSession,
     ):
-        """使用CPU进行密码破解"""
-        attempts = 0
-        max_attempts = self.config.get("max_attempts", 0)
+        """使用CPU进行密码破解 - 多进程模式下按批分发给进程池"""
+        processes = self.config.get("max_processes") or os.cpu_count() or 1
+        if not self.config.get("use_multiprocess", True) or processes <= 1:
+            self._crack_with_cpu_serial(dictionary_reader, total_passwords, session)
+            return
+
+        self.logger.log(f"使用 {processes} 个进程并行测试")
+        attempts = self.common_attempts
+        attempt_limit = self._attempt_limit()
+        batch_size = self._tuned_batch_size(processes)
+        self.logger.log(f"批大小: {batch_size}")
 
-        for password in dictionary_reader.read_single_password():
+        for password_batch in dictionary_reader.read_passwords(batch_size):
             if not self.is_running:
                 break
 
-            # 暂停检查
-            while self.is_paused and self.is_running:
-                time.sleep(0.1)
+            # 暂停时阻塞在事件上，恢复或停止时才唤醒
+            self._resume_event.wait()
+
+            if attempt_limit:
+                password_batch = password_batch[: attempt_limit - attempts]
+
+            # 进程池内各分片并行测试，任一命中后其余分片在下一次猜测前退出
+            index = self.archive_manager.test_password_batch(
+                self.archive_path, password_batch, processes
+            )
+            if index is not None:
+                attempts += index + 1
+                password = password_batch[index].decode("utf-8", errors="ignore")
+                elapsed_time = time.time() - self.start_time
+                self.result.success = True
+                self.result.password = password
+                self.result.attempts = attempts
+                self.result.elapsed_time = elapsed_time
+
+                self.logger.log(
+                    f"密码破解成功: {password} (尝试 {attempts} 次, 耗时 {elapsed_time:.2f} 秒)"
+                )
+                self.password_found.emit(password, attempts, elapsed_time)
+                self.crack_finished.emit(True, "")
+                return
+
+            attempts += len(password_batch)
+            self.tested_count += len(password_batch)
+
+            # 更新进度
+            self._record_progress(
+                attempts, total_passwords - dictionary_reader.skipped_count, password_batch[-1]
+            )
+
+            # 检查最大尝试次数限制
+            if attempt_limit and attempts >= attempt_limit:
+                self.logger.log(f"达到最大尝试次数限制: {attempt_limit - self.common_attempts}")
+                break
+
+        # 未找到密码
+        elapsed_time = time.time() - self.start_time
+        self.result.attempts = attempts
+        self.result.elapsed_time = elapsed_time
+
+        self.logger.log(
+            f"密码破解失败 (尝试 {attempts} 次, 耗时 {elapsed_time:.2f} 秒)"
+        )
+        self.crack_finished.emit(False, "未找到正确的密码")
+
+    def _crack_with_cpu_serial(
+        self,
+        dictionary_reader: DictionaryReader,
+        total_passwords: int,
+        session: ArchiveSession,
+    ):
+        """使用CPU在当前线程中逐个测试密码"""
+        attempts = self.common_attempts
+        attempt_limit = self._attempt_limit()
+        try_password = session.try_password_bytes
+
+        for pw_bytes in dictionary_reader.read_single_password():
+            if not self.is_running:
+                break
+
+            # 暂停时阻塞在事件上，恢复或停止时才唤醒
+            self._resume_event.wait()
 
             attempts += 1
-            self.speed_counter += 1
+            self.tested_count += 1
 
-            # 更新进度和速度
-            self.progress_updated.emit(attempts, total_passwords, password)
-            self._update_speed()
+            # 更新进度
+            self._record_progress(
+                attempts, total_passwords - dictionary_reader.skipped_count, pw_bytes
+            )
 
             # 测试密码
-            if self.archive_manager.test_password(self.archive_path, password):
+            if try_password(pw_bytes):
+                password = pw_bytes.decode("utf-8", errors="ignore")
                 elapsed_time = time.time() - self.start_time
                 self.result.success = True
                 self.result.password = password
@@ -135,8 +245,8 @@ class PasswordCrackWorker(QThread):
                 return
 
             # 检查最大尝试次数限制
-            if max_attempts > 0 and attempts >= max_attempts:
-                self.logger.log(f"达到最大尝试次数限制: {max_attempts}")
+            if attempt_limit and attempts >= attempt_limit:
+                self.logger.log(f"达到最大尝试次数限制: {attempt_limit - self.common_attempts}")
                 break
 
         # 未找到密码
@@ -150,74 +260,75 @@ class PasswordCrackWorker(QThread):
         self.crack_finished.emit(False, "未找到正确的密码")
 
     def _crack_with_gpu(
-        self, dictionary_reader: DictionaryReader, total_passwords: int
+        self,
+        dictionary_reader: DictionaryReader,
+        total_passwords: int,
+        session: ArchiveSession,
     ):
-        """使用GPU进行密码破解（批处理模式）"""
-        attempts = 0
-        max_attempts = self.config.get("max_attempts", 0)
+        """使用GPU进行密码破解（批处理模式）
+
+        GPU按双缓冲流水线执行：每批提交后返回的是上一批的确认结果，
+        读取和编码下一批字典时GPU仍在计算。
+        """
+        attempts = self.common_attempts
+        attempt_limit = self._attempt_limit()
         batch_size = self.config.get("batch_size", 1000)
+        verifier = session.zipcrypto_verifier()
 
-        for password_batch in dictionary_reader.read_passwords(batch_size):
+        for buf, lengths, overflow in dictionary_reader.read_password_batches_soa(
+            batch_size
+        ):
             if not self.is_running:
                 break
 
-            # 暂停检查
-            while self.is_paused and self.is_running:
-                time.sleep(0.1)
+            # 暂停时阻塞在事件上，恢复或停止时才唤醒
+            self._resume_event.wait()
 
-            attempts += len(password_batch)
-            self.speed_counter += len(password_batch)
+            batch_count = len(lengths) + len(overflow)
+            attempts += batch_count
+            self.tested_count += batch_count
 
             # 更新进度
-            current_password = password_batch[0] if password_batch else ""
-            self.progress_updated.emit(attempts, total_passwords, current_password)
-            self._update_speed()
+            if len(lengths):
+                current_password = buf[0, : lengths[0]].tobytes()
+            else:
+                current_password = overflow[0] if overflow else b""
+            self._record_progress(
+                attempts, total_passwords - dictionary_reader.skipped_count, current_password
+            )
 
             # 首先尝试GPU加速
             found_password = self.gpu_manager.test_passwords_with_gpu(
-                password_batch,
-                lambda pwd: self.archive_manager.test_password(self.archive_path, pwd),
+                buf, lengths, session.try_password_bytes, verifier
             )
 
             if found_password:
-                elapsed_time = time.time() - self.start_time
-                self.result.success = True
-                self.result.password = found_password
-                self.result.attempts = attempts
-                self.result.elapsed_time = elapsed_time
-                self.result.used_gpu = True
-
-                self.logger.log(
-                    f"密码破解成功 (GPU): {found_password} (尝试 {attempts} 次, 耗时 {elapsed_time:.2f} 秒)"
-                )
-                self.password_found.emit(found_password, attempts, elapsed_time)
-                self.crack_finished.emit(True, "")
+                self._report_success(found_password, attempts, "GPU", used_gpu=True)
                 return
 
-            # GPU未找到，回退到CPU逐个测试这个批次
-            for password in password_batch:
+            # GPU结果是权威的（候选已在CPU上确认），未命中直接处理下一批；
+            # 只有超长密码不进入GPU矩阵，在CPU上测试
+            for pw_bytes in overflow:
                 if not self.is_running:
                     break
 
-                if self.archive_manager.test_password(self.archive_path, password):
-                    elapsed_time = time.time() - self.start_time
-                    self.result.success = True
-                    self.result.password = password
-                    self.result.attempts = attempts
-                    self.result.elapsed_time = elapsed_time
-
-                    self.logger.log(
-                        f"密码破解成功 (CPU回退): {password} (尝试 {attempts} 次, 耗时 {elapsed_time:.2f} 秒)"
-                    )
-                    self.password_found.emit(password, attempts, elapsed_time)
-                    self.crack_finished.emit(True, "")
+                if session.try_password_bytes(pw_bytes):
+                    self._report_success(pw_bytes, attempts, "CPU")
                     return
 
             # 检查最大尝试次数限制
-            if max_attempts > 0 and attempts >= max_attempts:
-                self.logger.log(f"达到最大尝试次数限制: {max_attempts}")
+            if attempt_limit and attempts >= attempt_limit:
+                self.logger.log(f"达到最大尝试次数限制: {attempt_limit - self.common_attempts}")
                 break
 
+        # 取回仍在GPU上执行的最后一批；已停止时直接丢弃
+        found_password = self.gpu_manager.flush_gpu(
+            session.try_password_bytes if self.is_running else None
+        )
+        if found_password:
+            self._report_success(found_password, attempts, "GPU", used_gpu=True)
+            return
+
         # 未找到密码
         elapsed_time = time.time() - self.start_time
         self.result.attempts = attempts
@@ -228,28 +339,88 @@ class PasswordCrackWorker(QThread):
         )
         self.crack_finished.emit(False, "未找到正确的密码")
 
-    def _update_speed(self):
-        """更新测试速度"""
-        current_time = time.time()
-        if current_time - self.last_speed_update >= 1.0:  # 每秒更新一次
-            speed = self.speed_counter / (current_time - self.last_speed_update)
-            self.speed_updated.emit(speed)
-            self.last_speed_update = current_time
-            self.speed_counter = 0
+    def _try_common_passwords(self, session: ArchiveSession, total_passwords: int) -> bool:
+        """在遍历字典前测试常见密码，命中时发出成功信号并返回True
+
+        测试次数记入common_attempts，字典遍历的尝试次数从它开始计数；
+        同时记录每次猜测的耗时，用于确定多进程模式的批大小。
+        """
+        self.common_attempts = 0
+        total_passwords += len(DictionaryManager.COMMON_PASSWORDS)
+        latencies = []
+        for attempts, password in enumerate(DictionaryManager.COMMON_PASSWORDS, 1):
+            if not self.is_running:
+                break
+            self.tested_count += 1
+            self.common_attempts = attempts
+            pw_bytes = password.encode("utf-8")
+            self._record_progress(attempts, total_passwords, pw_bytes)
+            started = time.perf_counter()
+            found = session.try_password_bytes(pw_bytes)
+            latencies.append(time.perf_counter() - started)
+            if found:
+                self._report_success(pw_bytes, attempts, "常见密码")
+                return True
+        if latencies:
+            self.guess_latency = statistics.median(latencies)
+        return False
+
+    def _tuned_batch_size(self, processes: int) -> int:
+        """按单次猜测耗时选择批大小，使每批约耗时TARGET_BATCH_SECONDS
+
+        猜测很快时批次大，摊薄进程间通信；很慢（启动7z、密钥派生）时批次小，
+        各进程不会长时间空等，暂停和停止也能及时生效。
+        """
+        minimum = max(256, processes * 64)
+        if not self.guess_latency:
+            return minimum
+        batch_size = int(self.TARGET_BATCH_SECONDS * processes / self.guess_latency)
+        return max(processes * 4, min(self.MAX_BATCH_SIZE, batch_size))
+
+    def _attempt_limit(self) -> int:
+        """最大尝试次数对应的attempts上限，0表示不限制；常见密码不占用该限制"""
+        max_attempts = self.config.get("max_attempts", 0)
+        return self.common_attempts + max_attempts if max_attempts > 0 else 0
+
+    def _record_progress(self, attempts: int, total_passwords: int, pw_bytes: bytes):
+        """记录最新进度 - 不跨线程发信号，密码在引擎采样时才解码"""
+        self.progress_snapshot = (attempts, total_passwords, pw_bytes)
+
+    def _report_success(
+        self, pw_bytes: bytes, attempts: int, mode: str, used_gpu: bool = False
+    ):
+        """记录找到的密码并发出完成信号"""
+        password = pw_bytes.decode("utf-8", errors="ignore")
+        elapsed_time = time.time() - self.start_time
+        self.result.success = True
+        self.result.password = password
+        self.result.attempts = attempts
+        self.result.elapsed_time = elapsed_time
+        self.result.used_gpu = used_gpu
+
+        self.logger.log(
+            f"密码破解成功 ({mode}): {password} (尝试 {attempts} 次, 耗时 {elapsed_time:.2f} 秒)"
+        )
+        self.password_found.emit(password, attempts, elapsed_time)
+        self.crack_finished.emit(True, "")
 
     def pause(self):
         """暂停破解"""
         self.is_paused = True
+        self._resume_event.clear()
         self.logger.log("密码破解已暂停")
 
     def resume(self):
         """恢复破解"""
         self.is_paused = False
+        self._resume_event.set()
         self.logger.log("密码破解已恢复")
 
     def stop(self):
         """停止破解"""
         self.is_running = False
+        # 唤醒暂停中的破解循环，让它看到停止标志后退出
+        self._resume_event.set()
         self.logger.log("密码破解已停止")
 
         # 清理GPU资源
@@ -261,10 +432,14 @@ class PasswordCrackEngine(QObject):
     """密码破解引擎"""
 
     # 信号定义
-    progress_updated = Signal(int, int, str)
+    progress_updated = Signal(object)  # (当前进度, 总数, 当前密码, 速度)
     password_found = Signal(str, int, float)
     crack_finished = Signal(bool, str)
-    speed_updated = Signal(float)
+
+    # 进度采样间隔（毫秒）
+    PROGRESS_INTERVAL_MS = 100
+    # 速度按约1秒的窗口计算，窗口之间沿用上次的速度
+    SPEED_WINDOW_SECONDS = 1.0
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
@@ -272,6 +447,16 @@ class PasswordCrackEngine(QObject):
         self.worker = None
         self.logger = Logger()
 
+        # 在主线程中定时采样工作线程的进度和计数，合并为一次进度信号；
+        # 破解循环内不再计时和跨线程发信号
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(self.PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._sample_progress)
+        self._last_tested_count = 0
+        self._last_sample_time = 0.0
+        self._speed = 0.0
+        self._last_snapshot = None
+
     def start_crack(self, archive_path: str, dictionary_path: str) -> bool:
         """开始密码破解"""
         if self.worker and self.worker.isRunning():
@@ -282,20 +467,55 @@ class PasswordCrackEngine(QObject):
                 archive_path, dictionary_path, self.config
             )
 
-            # 连接信号
-            self.worker.progress_updated.connect(self.progress_updated)
-            self.worker.password_found.connect(self.password_found)
-            self.worker.crack_finished.connect(self.crack_finished)
-            self.worker.speed_updated.connect(self.speed_updated)
+            # 连接信号 - 先停止进度采样，完成后不会再有旧进度覆盖界面；
+            # 这些信号都从工作线程发出，明确使用排队连接，在主线程中按发出顺序处理
+            queued = Qt.QueuedConnection
+            self.worker.crack_finished.connect(self._progress_timer.stop, queued)
+            self.worker.password_found.connect(self.password_found, queued)
+            self.worker.crack_finished.connect(self.crack_finished, queued)
+            self.worker.finished.connect(self._progress_timer.stop, queued)
 
             # 启动工作线程
+            self._last_tested_count = 0
+            self._last_sample_time = time.time()
+            self._speed = 0.0
+            self._last_snapshot = None
             self.worker.start()
+            self._progress_timer.start()
             return True
 
         except Exception as e:
             self.logger.log(f"启动密码破解失败: {str(e)}")
             return False
 
+    def _sample_progress(self):
+        """采样工作线程的进度和已测试的密码数，进度或速度变化时发出一次进度信号"""
+        if not self.worker:
+            return
+        now = time.time()
+        speed_changed = False
+        elapsed = now - self._last_sample_time
+        if elapsed >= self.SPEED_WINDOW_SECONDS:
+            tested_count = self.worker.tested_count
+            self._speed = (tested_count - self._last_tested_count) / elapsed
+            self._last_tested_count = tested_count
+            self._last_sample_time = now
+            speed_changed = True
+
+        snapshot = self.worker.progress_snapshot
+        if snapshot is None or (snapshot is self._last_snapshot and not speed_changed):
+            return
+        self._last_snapshot = snapshot
+        attempts, total_passwords, pw_bytes = snapshot
+        self.progress_updated.emit(
+            (
+                attempts,
+                total_passwords,
+                pw_bytes.decode("utf-8", errors="ignore"),
+                self._speed,
+            )
+        )
+
     def pause_crack(self):
         """暂停密码破解"""
         if self.worker and self.worker.isRunning():
@@ -3,79 +3,244 @@
 合并重复的读取逻辑，简化接口
 """
 
+import hashlib
+import math
+import mmap
 import os
-from typing import Iterator, List, Union
-from PySide6.QtCore import QObject, Signal
+from typing import Iterator, List, Tuple, Union
 
+try:
+    import numpy as np  # 可选：GPU批处理需要连续的密码矩阵
+except ImportError:
+    np = None
 
-class DictionaryReader(QObject):
-    """统一的字典文件读取器"""
 
-    # 信号定义
-    progress_updated = Signal(int, int)  # 当前进度, 总数
+class _BloomFilter:
+    """布隆过滤器 - 字典去重用，内存固定；极少量未出现过的密码可能被误判为重复"""
 
-    def __init__(self, dictionary_path: str):
-        super().__init__()
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 64)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: bytes) -> bool:
+        """加入元素；元素此前未出现过时返回True"""
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        # 双重哈希：由两个64位值组合出hash_count个位置
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        added = False
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % self.size
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        return added
+
+
+class DictionaryReader:
+    """统一的字典文件读取器 - 进度由调用方（破解线程）按时间间隔汇报"""
+
+    # 超过该大小的字典使用mmap统计行数，避免整个文件读入内存
+    MMAP_THRESHOLD = 64 * 1024 * 1024
+    # 读取密码时每次读入的块大小
+    READ_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, dictionary_path: str, dedupe: bool = False):
+        """
+        Args:
+            dictionary_path: 字典文件路径
+            dedupe: 是否用布隆过滤器跳过重复的密码（适合合并字典和慢速校验的格式）
+        """
         self.dictionary_path = dictionary_path
+        self.dedupe = dedupe
         self.total_passwords = 0
         self.current_position = 0
+        # 读取时跳过的密码（UTF-8字节串），例如已经单独测试过的常见密码
+        self.exclude: frozenset = frozenset()
+        # 本次遍历中因exclude或去重跳过的密码数，total_passwords减去它即实际要测试的数量
+        self.skipped_count = 0
         self._count_passwords()
 
     def _count_passwords(self) -> None:
-        """计算字典文件中的密码总数"""
+        """计算字典文件中的密码总数
+
+        在字节层面统计换行符并扣除空行，不逐行解码；总数只用于显示进度，
+        连续多个空行或仅含空白的行可能导致少量偏差。
+        """
         try:
-            with open(self.dictionary_path, "r", encoding="utf-8", errors="ignore") as f:
-                self.total_passwords = sum(1 for line in f if line.strip())
+            size = os.path.getsize(self.dictionary_path)
+            if size == 0:
+                self.total_passwords = 0
+                return
+            with open(self.dictionary_path, "rb") as f:
+                self._advise_sequential(f)
+                if size < self.MMAP_THRESHOLD:
+                    self.total_passwords = self._count_lines(f.read())
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        self.total_passwords = self._count_lines(mm)
         except Exception as e:
             print(f"计算密码总数失败: {e}")
             self.total_passwords = 0
 
-    def read_passwords(self, batch_size: int = None) -> Iterator[Union[str, List[str]]]:
-        """统一的密码读取方法
-        
+    @staticmethod
+    def _advise_sequential(f) -> None:
+        """提示内核按顺序读取该文件，加大预读（仅支持posix_fadvise的系统）"""
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+    @classmethod
+    def _count_lines(cls, data) -> int:
+        """统计非空行数 - bytes.count在C层扫描；mmap按块切片统计"""
+        if isinstance(data, bytes):
+            count = cls._count_separators(data)
+        else:
+            # mmap没有count方法，按块统计；带上前一块末尾2字节以覆盖跨块的空行
+            count = 0
+            prev = b""
+            for start in range(0, len(data), cls.READ_CHUNK_SIZE * 16):
+                chunk = prev + data[start : start + cls.READ_CHUNK_SIZE * 16]
+                count += cls._count_separators(chunk) - cls._count_separators(prev)
+                prev = chunk[-2:]
+        # 文件开头的空行
+        if data[:1] == b"\n" or data[:2] == b"\r\n":
+            count -= 1
+        # 最后一行没有换行符
+        if data[-1:] != b"\n":
+            count += 1
+        return max(count, 0)
+
+    @staticmethod
+    def _count_separators(data: bytes) -> int:
+        """换行符数减去空行数"""
+        return data.count(b"\n") - data.count(b"\n\n") - data.count(b"\n\r\n")
+
+    def read_passwords(self, batch_size: int = None) -> Iterator[Union[bytes, List[bytes]]]:
+        """统一的密码读取方法，密码以UTF-8字节串返回（不解码，直接交给校验）
+
         Args:
             batch_size: 批量大小。如果为None或1，逐个返回密码；否则批量返回
         """
         try:
-            with open(self.dictionary_path, "r", encoding="utf-8", errors="ignore") as f:
-                if batch_size is None or batch_size <= 1:
-                    # 单个读取模式
-                    yield from self._read_single_passwords(f)
-                else:
-                    # 批量读取模式
-                    yield from self._read_password_batches(f, batch_size)
+            if batch_size is None or batch_size <= 1:
+                # 单个读取模式
+                yield from self._read_single_passwords()
+            else:
+                # 批量读取模式
+                yield from self._read_password_batches(batch_size)
         except Exception as e:
             print(f"读取字典文件失败: {e}")
 
-    def _read_single_passwords(self, file_obj) -> Iterator[str]:
+    def _iter_line_chunks(self) -> Iterator[List[bytes]]:
+        """按大块读取字典，每块切分为一组行（未去除空白，包括空行）"""
+        with open(self.dictionary_path, "rb", buffering=0) as f:
+            self._advise_sequential(f)
+            tail = b""
+            while True:
+                chunk = f.read(self.READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                cut = chunk.rfind(b"\n")
+                if cut < 0:
+                    tail += chunk
+                    continue
+                yield (tail + chunk[:cut]).split(b"\n")
+                tail = chunk[cut + 1 :]
+            if tail:
+                yield [tail]
+
+    def _iter_lines(self) -> Iterator[bytes]:
+        """逐行返回去除首尾空白的行（包括空行）"""
+        for lines in self._iter_line_chunks():
+            for line in lines:
+                yield line.strip()
+
+    def _read_single_passwords(self) -> Iterator[bytes]:
         """逐个读取密码"""
-        for line_num, line in enumerate(file_obj, 1):
-            password = line.strip()
-            if password:
+        exclude = self.exclude
+        seen_add = self._new_seen_filter()
+        self.skipped_count = 0
+        for line_num, password in enumerate(self._iter_lines(), 1):
+            if not password:
+                continue
+            if password not in exclude and (seen_add is None or seen_add(password)):
                 self.current_position = line_num
-                if line_num % 100 == 0:  # 每100个密码更新一次进度
-                    self.progress_updated.emit(self.current_position, self.total_passwords)
                 yield password
+            else:
+                self.skipped_count += 1
 
-    def _read_password_batches(self, file_obj, batch_size: int) -> Iterator[List[str]]:
-        """批量读取密码"""
-        batch = []
-        for line_num, line in enumerate(file_obj, 1):
-            password = line.strip()
-            if password:
-                batch.append(password)
-                
-                if len(batch) >= batch_size:
-                    self.current_position = line_num
-                    self.progress_updated.emit(self.current_position, self.total_passwords)
-                    yield batch
-                    batch = []
+    def _read_password_batches(self, batch_size: int) -> Iterator[List[bytes]]:
+        """批量读取密码 - 每个读取块整体过滤，再按batch_size切片，不逐行追加"""
+        exclude = self.exclude
+        seen_add = self._new_seen_filter()
+        self.skipped_count = 0
+        pending: List[bytes] = []
+        line_num = 0
+        for lines in self._iter_line_chunks():
+            line_num += len(lines)
+            passwords = list(filter(None, map(bytes.strip, lines)))
+            if exclude or seen_add is not None:
+                kept = passwords
+                if exclude:
+                    kept = [password for password in kept if password not in exclude]
+                if seen_add is not None:
+                    kept = [password for password in kept if seen_add(password)]
+                self.skipped_count += len(passwords) - len(kept)
+                passwords = kept
+            pending.extend(passwords)
+
+            if len(pending) >= batch_size:
+                self.current_position = line_num
+                full = len(pending) - len(pending) % batch_size
+                for start in range(0, full, batch_size):
+                    yield pending[start : start + batch_size]
+                pending = pending[full:]
 
         # 返回剩余的密码
-        if batch:
+        if pending:
             self.current_position = self.total_passwords
-            self.progress_updated.emit(self.current_position, self.total_passwords)
-            yield batch
+            yield pending
+
+    def _new_seen_filter(self):
+        """每次遍历字典新建去重过滤器，返回其add方法；未启用去重时返回None"""
+        if not self.dedupe:
+            return None
+        return _BloomFilter(self.total_passwords).add
+
+    def read_password_batches_soa(
+        self, batch_size: int, max_len: int = 64
+    ) -> Iterator[Tuple["np.ndarray", "np.ndarray", List[bytes]]]:
+        """按批读取密码，排成连续的 (N, max_len) uint8 矩阵和长度数组，供GPU一次传输
+
+        超过max_len字节的密码不放入矩阵，单独以列表返回，由调用方在CPU上测试。需要numpy。
+
+        Yields:
+            (密码矩阵, 长度数组, 超长密码列表)
+        """
+        for batch in self.read_passwords(max(batch_size, 2)):
+            fitting = [password for password in batch if len(password) <= max_len]
+            overflow = (
+                [password for password in batch if len(password) > max_len]
+                if len(fitting) != len(batch)
+                else []
+            )
+            count = len(fitting)
+            # 在C层补齐并拼接，一次构造整个矩阵
+            buf = np.frombuffer(
+                b"".join(password.ljust(max_len, b"\0") for password in fitting),
+                dtype=np.uint8,
+            ).reshape(count, max_len)
+            lengths = np.fromiter(map(len, fitting), dtype=np.int32, count=count)
+            yield buf, lengths, overflow
 
     def get_total_passwords(self) -> int:
         """获取密码总数"""
@@ -113,7 +278,7 @@ class DictionaryReader(QObject):
         return result
     
     # 向后兼容的方法
-    def read_single_password(self) -> Iterator[str]:
+    def read_single_password(self) -> Iterator[bytes]:
         """逐个读取密码（向后兼容）"""
         return self.read_passwords(batch_size=1)
 
@@ -130,6 +295,8 @@ class DictionaryManager:
         "harley", "1234", "1111", "0000", "password1", "123321",
         "666666", "654321", "7777777", "123", "888888",
     ]
+    # 常见密码的UTF-8字节串，用于从字典中排除已测试过的密码
+    COMMON_PASSWORD_BYTES = frozenset(password.encode("utf-8") for password in COMMON_PASSWORDS)
 
     @staticmethod
     def create_sample_dictionary(file_path: str, passwords: List[str] = None) -> bool:
@@ -1,31 +1,73 @@
 """
 GPU加速模块 - 重构简化版
-由于当前所有GPU加速器的实现都是空的，简化为一个统一的管理器
+统一的GPU管理器，目前实现了基于Numba CUDA的ZIP传统加密批量预检
 """
 
 import platform
-from typing import List, Optional, Dict, Any
+import subprocess
+import sys
+from typing import List, Optional, Dict, Any, Tuple
+
+
+# GPU库探测结果，键为指定的加速库（None表示全部探测），值为 (可用库, OpenCL设备)；
+# 驱动初始化较慢，进程内所有GPUManager共享
+_gpu_probe_cache: Dict[Optional[str], Tuple[List[str], List[str]]] = {}
+# 系统信息（含NVIDIA驱动检查），进程内只收集一次
+_system_info_cache: Optional[Dict[str, Any]] = None
 
 
 class GPUManager:
-    """简化的GPU管理器 - 当前版本暂不支持GPU加速"""
-    
-    def __init__(self):
+    """简化的GPU管理器 - 检测到Numba CUDA时可对ZIP传统加密做批量预检"""
+
+    # 探测顺序：开销小的在前；pycuda只初始化驱动，不创建上下文
+    PROBE_ORDER = ("Numba-CUDA", "OpenCL", "CUDA")
+    # Linux下NVIDIA驱动的版本信息文件
+    NVIDIA_PROC_VERSION = "/proc/driver/nvidia/version"
+
+    def __init__(self, preferred: Optional[str] = None):
+        """
+        Args:
+            preferred: 指定使用的加速库（PROBE_ORDER中的名称），只探测该库；None时全部探测
+        """
+        self.preferred = preferred if preferred in self.PROBE_ORDER else None
         self.gpu_available = False
         self.gpu_info = {}
+        # ZipCrypto预检内核及其对应的预检数据，同一压缩包的批次间复用
+        self._zipcrypto_kernel = None
+        self._zipcrypto_verifier = None
+        # 已提交到GPU但尚未确认的批次：(槽位, 密码矩阵, 长度数组)
+        self._pending_batch = None
+        # 所有平台上的OpenCL GPU设备名称，最快的在前
+        self.opencl_devices: List[str] = []
         self._detect_gpu()
     
-    def _detect_gpu(self) -> None:
-        """检测GPU环境"""
-        # 检查各种GPU库的可用性
-        gpu_libs = self._check_gpu_libraries()
+    def _detect_gpu(self, refresh: bool = False) -> None:
+        """检测GPU环境 - 探测结果在进程内缓存，refresh为True时重新探测"""
+        cached = None if refresh else _gpu_probe_cache.get(self.preferred)
+        if cached is None:
+            self.opencl_devices = []
+            # 检查各种GPU库的可用性
+            gpu_libs = self._check_gpu_libraries()
+            cached = _gpu_probe_cache[self.preferred] = (gpu_libs, self.opencl_devices)
+        gpu_libs = list(cached[0])
+        self.opencl_devices = list(cached[1])
         
-        if gpu_libs:
+        # 目前只有Numba CUDA实现了校验内核
+        self.gpu_available = "Numba-CUDA" in gpu_libs
+
+        if self.gpu_available:
+            print(f"检测到GPU库: {', '.join(gpu_libs)}")
+            self.gpu_info = {
+                "available_libraries": gpu_libs,
+                "status": "Numba CUDA可用",
+                "note": "ZIP传统加密使用GPU批量预检，其他格式使用CPU处理"
+            }
+        elif gpu_libs:
             print(f"检测到GPU库: {', '.join(gpu_libs)}")
             self.gpu_info = {
                 "available_libraries": gpu_libs,
                 "status": "GPU库可用但未实现加速功能",
-                "note": "当前版本使用CPU处理，未来可扩展GPU支持"
+                "note": "GPU加速需要Numba CUDA，当前使用CPU处理"
             }
         else:
             print("未检测到GPU加速库")
@@ -33,74 +75,191 @@ class GPUManager:
                 "status": "未检测到GPU库",
                 "note": "使用CPU处理"
             }
+        if self.opencl_devices:
+            self.gpu_info["opencl_devices"] = self.opencl_devices
     
     def _check_gpu_libraries(self) -> List[str]:
-        """检查可用的GPU库"""
+        """按PROBE_ORDER检查可用的GPU库，指定了加速库时只检查该库"""
+        probes = {
+            "Numba-CUDA": self._probe_numba_cuda,
+            "OpenCL": self._probe_opencl,
+            "CUDA": self._probe_pycuda,
+        }
+        names = (self.preferred,) if self.preferred else self.PROBE_ORDER
         available_libs = []
-        
-        # 检查CUDA
-        try:
-            import pycuda.driver as cuda
-            import pycuda.autoinit
-            cuda.init()
-            if cuda.Device.count() > 0:
-                available_libs.append("CUDA")
-        except (ImportError, Exception):
-            pass
-        
-        # 检查OpenCL
-        try:
-            import pyopencl as cl
-            platforms = cl.get_platforms()
-            if platforms:
-                for platform in platforms:
-                    devices = platform.get_devices(cl.device_type.GPU)
-                    if devices:
-                        available_libs.append("OpenCL")
-                        break
-        except (ImportError, Exception):
-            pass
-        
-        # 检查Numba CUDA
-        try:
-            from numba import cuda as numba_cuda
-            if numba_cuda.is_available():
-                available_libs.append("Numba-CUDA")
-        except (ImportError, Exception):
-            pass
-            
+        for name in names:
+            try:
+                if probes[name]():
+                    available_libs.append(name)
+            except (ImportError, Exception):
+                pass
         return available_libs
+
+    @staticmethod
+    def _probe_numba_cuda() -> bool:
+        """检查Numba CUDA"""
+        from numba import cuda as numba_cuda
+        return numba_cuda.is_available()
+
+    def _probe_opencl(self) -> bool:
+        """检查OpenCL - 枚举所有平台上的GPU设备，按计算单元数×频率从快到慢排列"""
+        import pyopencl as cl
+        devices = []
+        for cl_platform in cl.get_platforms():
+            try:
+                devices.extend(cl_platform.get_devices(cl.device_type.GPU))
+            except Exception:
+                # 没有GPU设备的平台会抛出DEVICE_NOT_FOUND
+                continue
+        devices.sort(
+            key=lambda d: d.max_compute_units * d.max_clock_frequency,
+            reverse=True,
+        )
+        self.opencl_devices = [d.name.strip() for d in devices]
+        return bool(devices)
+
+    @staticmethod
+    def _probe_pycuda() -> bool:
+        """检查CUDA - 只初始化驱动并统计设备，不导入pycuda.autoinit创建上下文"""
+        import pycuda.driver as cuda
+        cuda.init()
+        return cuda.Device.count() > 0
     
+    def refresh_detection(self) -> None:
+        """重新探测GPU环境（例如安装驱动后），并释放已初始化的内核"""
+        global _system_info_cache
+        self.cleanup()
+        self._detect_gpu(refresh=True)
+        _system_info_cache = None
+
     def is_gpu_available(self) -> bool:
-        """检查GPU是否可用（当前总是返回False）"""
+        """检查GPU加速是否可用（需要Numba CUDA）"""
         return self.gpu_available
     
+    def has_implementation(self, verifier: Optional[tuple] = None) -> bool:
+        """检查是否有可用于该压缩包的GPU内核
+
+        verifier为ArchiveSession.zipcrypto_verifier()的结果；内核在此预先初始化，
+        初始化失败时返回False，调用者应直接使用CPU模式而不是在每批上回退。
+        """
+        return self._get_zipcrypto_kernel(verifier) is not None
+
     def get_gpu_info(self) -> Dict[str, Any]:
         """获取GPU信息"""
         return self.gpu_info
     
-    def test_passwords_with_gpu(self, passwords: List[str], test_func) -> Optional[str]:
-        """GPU密码测试（当前未实现，返回None触发CPU回退）"""
-        # TODO: 未来版本可以在这里实现真正的GPU加速
-        # 目前直接返回None，让调用者回退到CPU处理
+    def test_passwords_with_gpu(
+        self, buf, lengths, test_func, verifier: Optional[tuple] = None
+    ) -> Optional[bytes]:
+        """GPU密码测试 - 在GPU上批量校验ZipCrypto校验字节，通过的候选交给test_func确认
+
+        buf/lengths为DictionaryReader.read_password_batches_soa生成的密码矩阵和长度数组；
+        verifier为 (加密头, 校验字节, 成员数)；调用前应先用has_implementation确认内核可用。
+
+        批次以流水线方式执行：本批异步提交后立即确认上一批的候选并返回结果，
+        调用方读取下一批时GPU仍在计算。最后一批须调用flush_gpu取回。
+        """
+        kernel = self._get_zipcrypto_kernel(verifier)
+        if kernel is None:
+            return None
+
+        previous = self._pending_batch
+        self._pending_batch = None
+        if len(lengths):
+            self._pending_batch = (kernel.submit(buf, lengths), buf, lengths)
+
+        found = self._confirm_candidates(kernel, previous, test_func)
+        if found is not None:
+            self._pending_batch = None
+        return found
+
+    def flush_gpu(self, test_func=None) -> Optional[bytes]:
+        """取回最后一个已提交批次的结果；test_func为None时直接丢弃"""
+        previous = self._pending_batch
+        self._pending_batch = None
+        if previous is None or test_func is None or self._zipcrypto_kernel is None:
+            return None
+        return self._confirm_candidates(self._zipcrypto_kernel, previous, test_func)
+
+    @staticmethod
+    def _confirm_candidates(kernel, pending, test_func) -> Optional[bytes]:
+        """等待批次完成，校验字节仍有误判，候选按字典顺序逐个在CPU上确认"""
+        if pending is None:
+            return None
+        slot, buf, lengths = pending
+        for index in kernel.collect(slot):
+            password = buf[index, : lengths[index]].tobytes()
+            if test_func(password):
+                return password
         return None
+
+    def _get_zipcrypto_kernel(self, verifier: Optional[tuple]):
+        """获取ZipCrypto预检内核，预检数据变化时重新上传"""
+        if not self.gpu_available or verifier is None:
+            return None
+        if self._zipcrypto_kernel is not None and self._zipcrypto_verifier == verifier:
+            return self._zipcrypto_kernel
+
+        try:
+            from .gpu_kernels import ZipCryptoKernel
+
+            self._pending_batch = None
+            self._zipcrypto_kernel = ZipCryptoKernel(*verifier)
+            self._zipcrypto_verifier = verifier
+        except Exception as e:
+            print(f"初始化GPU校验内核失败，使用CPU处理: {e}")
+            self.gpu_available = False
+            self._zipcrypto_kernel = None
+            self._zipcrypto_verifier = None
+        return self._zipcrypto_kernel
     
     def cleanup(self) -> None:
-        """清理资源（简化版无需清理）"""
-        pass
+        """清理资源 - 释放GPU上的预检数据和双缓冲区"""
+        self._pending_batch = None
+        self._zipcrypto_kernel = None
+        self._zipcrypto_verifier = None
     
     @staticmethod
     def get_system_info() -> Dict[str, Any]:
-        """获取系统信息"""
+        """获取系统信息 - 结果在进程内缓存，返回副本"""
+        global _system_info_cache
+        if _system_info_cache is None:
+            _system_info_cache = GPUManager._collect_system_info()
+        return dict(_system_info_cache)
+
+    @staticmethod
+    def _collect_system_info() -> Dict[str, Any]:
+        """收集系统信息和各GPU库的可用性（复用GPU库探测缓存）"""
+        gpu_libs = GPUManager().get_gpu_info().get("available_libraries", [])
         info = {
             "platform": platform.platform(),
             "processor": platform.processor(),
             "architecture": platform.architecture(),
+            "cuda_available": "CUDA" in gpu_libs,
+            "opencl_available": "OpenCL" in gpu_libs,
+            "numba_cuda_available": "Numba-CUDA" in gpu_libs,
         }
         
-        # 检查NVIDIA驱动
+        # Linux上驱动加载后才存在该文件，读一次即可，无需NVML或子进程
+        if sys.platform.startswith("linux"):
+            info["nvidia_driver"] = False
+            try:
+                with open(GPUManager.NVIDIA_PROC_VERSION, "r", encoding="utf-8") as f:
+                    info["gpu_details"] = f.readline().strip()
+                info["nvidia_driver"] = True
+            except OSError:
+                pass
+            return info
+
+        # 其他系统优先在进程内查询NVML，未安装pynvml时才启动nvidia-smi
+        driver_version = GPUManager._query_nvml_driver_version()
+        if driver_version is not None:
+            info["nvidia_driver"] = bool(driver_version)
+            if driver_version:
+                info["gpu_details"] = f"NVIDIA Driver Version: {driver_version}"
+            return info
+
         try:
-            import subprocess
             result = subprocess.run(["nvidia-smi"], capture_output=True, text=True, timeout=5)
             info["nvidia_driver"] = result.returncode == 0
             if result.returncode == 0:
@@ -113,4 +272,31 @@ class GPUManager:
         except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
             info["nvidia_driver"] = False
         
-        return info
\ No newline at end of file
+        return info
+
+    @staticmethod
+    def _query_nvml_driver_version() -> Optional[str]:
+        """通过pynvml查询NVIDIA驱动版本
+
+        Returns:
+            驱动版本；NVML初始化失败（无驱动）时返回空字符串；未安装pynvml时返回None
+        """
+        try:
+            import pynvml
+        except ImportError:
+            return None
+
+        try:
+            pynvml.nvmlInit()
+        except Exception:
+            return ""
+        try:
+            version = pynvml.nvmlSystemGetDriverVersion()
+            # 旧版pynvml返回bytes
+            if isinstance(version, bytes):
+                version = version.decode("utf-8", errors="ignore")
+            return version
+        except Exception:
+            return ""
+        finally:
+            pynvml.nvmlShutdown()
\ No newline at end of file
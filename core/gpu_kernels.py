@@ -0,0 +1,141 @@
+"""
+GPU密码校验内核 - 基于Numba CUDA
+
+只在GPUManager确认Numba CUDA可用时按需导入，缺少numba/numpy时导入失败由调用方处理。
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from numba import cuda
+
+from .crypto_kernel import _CRC_TABLE
+
+# 每个线程块的线程数
+THREADS_PER_BLOCK = 256
+
+_CRC_TABLE_HOST = np.array(_CRC_TABLE, dtype=np.uint32)
+
+
+@cuda.jit
+def _zipcrypto_check_kernel(
+    passwords, lengths, enc_headers, check_bytes, member_count, crc_table, flags
+):
+    """每个线程校验一个候选密码的ZipCrypto校验字节
+
+    与crypto_kernel.verify_pkzip_headers相同：密钥只初始化一次，依次解密各成员的
+    12字节加密头并比较最后一个字节。非ASCII密码在ZIP中的编码不确定，直接标记为候选。
+    """
+    i = cuda.grid(1)
+    if i >= passwords.shape[0]:
+        return
+
+    length = lengths[i]
+    key0 = np.int64(305419896)
+    key1 = np.int64(591751049)
+    key2 = np.int64(878082192)
+    for j in range(length):
+        c = np.int64(passwords[i, j])
+        if c >= 0x80:
+            flags[i] = 1
+            return
+        key0 = (key0 >> 8) ^ np.int64(crc_table[(key0 ^ c) & 0xFF])
+        key1 = (key1 + (key0 & 0xFF)) & 0xFFFFFFFF
+        key1 = (key1 * 134775813 + 1) & 0xFFFFFFFF
+        key2 = (key2 >> 8) ^ np.int64(crc_table[(key2 ^ (key1 >> 24)) & 0xFF])
+
+    for m in range(member_count):
+        k0 = key0
+        k1 = key1
+        k2 = key2
+        c = np.int64(0)
+        for j in range(12):
+            # 只有低16位参与计算，乘积不会溢出
+            k = (k2 | 2) & 0xFFFF
+            c = np.int64(enc_headers[m * 12 + j]) ^ (((k * (k ^ 1)) >> 8) & 0xFF)
+            k0 = (k0 >> 8) ^ np.int64(crc_table[(k0 ^ c) & 0xFF])
+            k1 = (k1 + (k0 & 0xFF)) & 0xFFFFFFFF
+            k1 = (k1 * 134775813 + 1) & 0xFFFFFFFF
+            k2 = (k2 >> 8) ^ np.int64(crc_table[(k2 ^ (k1 >> 24)) & 0xFF])
+        if c != check_bytes[m]:
+            flags[i] = 0
+            return
+
+    flags[i] = 1
+
+
+class _PipelineSlot:
+    """双缓冲中的一个槽位：页锁定的主机缓冲区和独立的CUDA流"""
+
+    def __init__(self, rows: int, width: int):
+        self.stream = cuda.stream()
+        self.host_buf = cuda.pinned_array((rows, width), dtype=np.uint8)
+        self.host_lengths = cuda.pinned_array(rows, dtype=np.int32)
+        self.host_flags = cuda.pinned_array(rows, dtype=np.uint8)
+        self.count = 0
+
+    def fits(self, rows: int, width: int) -> bool:
+        return self.host_buf.shape[0] >= rows and self.host_buf.shape[1] == width
+
+
+class ZipCryptoKernel:
+    """ZipCrypto批量预检 - 加密头和CRC表只上传一次，每批只传输密码
+
+    两个槽位轮流使用：一批在GPU上执行时，调用方可以读取下一批并确认上一批的候选。
+    """
+
+    def __init__(self, enc_headers: bytes, check_bytes: bytes, member_count: int):
+        self.member_count = member_count
+        self._d_enc_headers = cuda.to_device(np.frombuffer(bytes(enc_headers), dtype=np.uint8))
+        self._d_check_bytes = cuda.to_device(np.frombuffer(bytes(check_bytes), dtype=np.uint8))
+        self._d_crc_table = cuda.to_device(_CRC_TABLE_HOST)
+        self._slots: List[Optional[_PipelineSlot]] = [None, None]
+        self._next_slot = 0
+
+    def submit(self, buf: np.ndarray, lengths: np.ndarray) -> _PipelineSlot:
+        """异步提交一批密码，立即返回槽位，结果由collect取回
+
+        buf为 (N, 最大长度) 的uint8密码矩阵，lengths为各密码的字节数。
+        """
+        count, width = buf.shape
+        index = self._next_slot
+        self._next_slot ^= 1
+        slot = self._slots[index]
+        if slot is None or not slot.fits(count, width):
+            if slot is not None:
+                slot.stream.synchronize()
+            slot = self._slots[index] = _PipelineSlot(count, width)
+        else:
+            # 该槽位上一次提交的传输可能尚未完成，覆盖主机缓冲区前先等待
+            slot.stream.synchronize()
+
+        host_buf = slot.host_buf[:count]
+        host_lengths = slot.host_lengths[:count]
+        host_buf[...] = buf
+        host_lengths[...] = lengths
+        slot.count = count
+
+        stream = slot.stream
+        d_flags = cuda.device_array(count, dtype=np.uint8, stream=stream)
+        blocks = (count + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+        _zipcrypto_check_kernel[blocks, THREADS_PER_BLOCK, stream](
+            cuda.to_device(host_buf, stream=stream),
+            cuda.to_device(host_lengths, stream=stream),
+            self._d_enc_headers,
+            self._d_check_bytes,
+            self.member_count,
+            self._d_crc_table,
+            d_flags,
+        )
+        d_flags.copy_to_host(slot.host_flags[:count], stream=stream)
+        return slot
+
+    @staticmethod
+    def collect(slot: _PipelineSlot) -> np.ndarray:
+        """等待槽位上的批次完成，返回通过校验字节检查的密码下标（升序）"""
+        slot.stream.synchronize()
+        return np.flatnonzero(slot.host_flags[: slot.count])
+
+    def find_candidates(self, buf: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """同步校验一批密码，返回通过校验字节检查的密码下标（升序）"""
+        return self.collect(self.submit(buf, lengths))
@@ -2,19 +2,92 @@
 日志记录模块
 """
 
+import atexit
 import os
 import logging
+import logging.handlers
 import datetime
+import queue
+import threading
+import time
 from typing import Optional
 
 
+class _LogFormatter(logging.Formatter):
+    """日志格式化器 - 输出格式为 "时间 - 名称 - 级别 - 消息"，时间字符串每秒只生成一次"""
+
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self):
+        super().__init__(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt=self.DATE_FORMAT,
+        )
+        # (整数秒, 时间字符串)，整体替换以免多线程下两者不一致
+        self._time_cache = (-1, "")
+
+    def format(self, record: logging.LogRecord) -> str:
+        # 带异常或调用栈的记录交给标准实现追加详细信息
+        if record.exc_info or record.exc_text or record.stack_info:
+            return super().format(record)
+
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second != cached_second:
+            cached_time = time.strftime(self.DATE_FORMAT, self.converter(second))
+            self._time_cache = (second, cached_time)
+        return f"{cached_time} - {record.name} - {record.levelname} - {record.getMessage()}"
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """后台写日志的监听线程 - 收到刷新标记时刷新各处理器并通知等待方"""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        flush_event = getattr(record, "flush_event", None)
+        if flush_event is None:
+            super().handle(record)
+            return
+        # 标记之前的日志都已交给处理器，刷新后即已写入文件
+        for handler in self.handlers:
+            handler.flush()
+        flush_event.set()
+
+
+# 后台写日志的监听线程及其处理器，进程内只有一份，日志文件或级别变化时才替换
+_queue_listener: Optional[_FlushingQueueListener] = None
+_memory_handler: Optional[logging.handlers.MemoryHandler] = None
+_installed_key: Optional[tuple] = None
+# 设置、替换和停止监听线程时持有，刷新不需要
+_listener_lock = threading.Lock()
+
+
+def _stop_queue_listener():
+    """停止后台监听线程 - 处理完队列中剩余的日志后返回"""
+    global _queue_listener, _installed_key
+    with _listener_lock:
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            _queue_listener = None
+            _installed_key = None
+
+
+# 在logging.shutdown关闭处理器之前把队列中的日志写完
+atexit.register(_stop_queue_listener)
+
+
 class Logger:
     """日志记录器"""
 
+    # 文件日志先缓存在内存中，满该条数或出现ERROR级别时才写入磁盘
+    LOG_BUFFER_CAPACITY = 512
+    # 等待后台线程处理刷新标记的最长时间（秒）
+    FLUSH_TIMEOUT = 5.0
+
     def __init__(self, log_directory: str = "logs", log_level: int = logging.INFO):
         self.log_directory = log_directory
         self.log_level = log_level
         self.logger = None
+        self.log_path = ""
         self._setup_logger()
 
     def _setup_logger(self):
@@ -27,14 +100,35 @@ class Logger:
         today = datetime.datetime.now().strftime("%Y%m%d")
         log_filename = f"compress_password_probe_{today}.log"
         log_path = os.path.join(self.log_directory, log_filename)
+        # 文件处理器在设置时打开该文件，之后一直写入这里
+        self.log_path = log_path
 
         # 配置日志记录器
         self.logger = logging.getLogger("CompressPasswordProbe")
         self.logger.setLevel(self.log_level)
 
-        # 清除已存在的处理器
+        with _listener_lock:
+            self._install_handlers(log_path)
+
+    def _install_handlers(self, log_path: str):
+        """安装队列处理器和后台监听线程 - 日志文件和级别未变时复用已安装的（调用方持有_listener_lock）"""
+        global _queue_listener, _memory_handler, _installed_key
+        key = (os.path.abspath(log_path), self.log_level)
+        if _queue_listener is not None and _installed_key == key:
+            self.memory_handler = _memory_handler
+            return
+
+        # 清除已存在的处理器（先停止监听线程并关闭，把队列和缓存中的日志写入文件）
+        previous_listener = _queue_listener
+        _queue_listener = None
+        _installed_key = None
+        if previous_listener is not None:
+            previous_listener.stop()
+            for handler in previous_listener.handlers:
+                handler.close()
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+            handler.close()
 
         # 文件处理器
         file_handler = logging.FileHandler(log_path, encoding="utf-8")
@@ -45,23 +139,50 @@ class Logger:
         console_handler.setLevel(self.log_level)
 
         # 格式化器
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        formatter = _LogFormatter()
 
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
-        # 添加处理器
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 文件写入经内存缓冲批量进行，避免每条日志都写一次磁盘
+        self.memory_handler = logging.handlers.MemoryHandler(
+            capacity=self.LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        self.memory_handler.setLevel(self.log_level)
+
+        # 调用方只把日志放入队列，格式化和文件、控制台输出都在后台线程进行
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _queue_listener = _FlushingQueueListener(
+            log_queue, self.memory_handler, console_handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        _memory_handler = self.memory_handler
+        _installed_key = key
 
     def log(self, message: str, level: int = logging.INFO):
         """记录日志"""
         if self.logger:
             self.logger.log(level, message)
 
+    def flush(self):
+        """把队列和缓存中的日志写入文件
+
+        向队列放入刷新标记并等待后台线程处理，不停止监听线程，可在多个线程中同时调用。
+        """
+        listener = _queue_listener
+        if listener is None or self.memory_handler not in listener.handlers:
+            self.memory_handler.flush()
+            return
+        flush_event = threading.Event()
+        listener.queue.put_nowait(logging.makeLogRecord({"flush_event": flush_event}))
+        if not flush_event.wait(self.FLUSH_TIMEOUT):
+            # 监听线程已停止（停止时会写完队列中的日志），直接刷新缓存
+            self.memory_handler.flush()
+
     def info(self, message: str):
         """记录信息日志"""
         self.log(message, logging.INFO)
@@ -84,27 +205,31 @@ class Logger:
         """记录破解会话"""
         session_start = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        self.info("=" * 50)
-        self.info(f"破解会话开始: {session_start}")
-        self.info(f"压缩文件: {archive_path}")
-        self.info(f"字典文件: {dictionary_path}")
+        # 整个会话记录合成一条多行日志，只格式化和写入一次
+        lines = [
+            "=" * 50,
+            f"破解会话开始: {session_start}",
+            f"压缩文件: {archive_path}",
+            f"字典文件: {dictionary_path}",
+        ]
 
         if result:
-            self.info(f"破解结果: {'成功' if result.get('success', False) else '失败'}")
+            lines.append(f"破解结果: {'成功' if result.get('success', False) else '失败'}")
             if result.get("success", False):
-                self.info(f"找到密码: {result.get('password', '')}")
-            self.info(f"尝试次数: {result.get('attempts', 0)}")
-            self.info(f"耗时: {result.get('elapsed_time', 0):.2f} 秒")
+                lines.append(f"找到密码: {result.get('password', '')}")
+            lines.append(f"尝试次数: {result.get('attempts', 0)}")
+            lines.append(f"耗时: {result.get('elapsed_time', 0):.2f} 秒")
             if result.get("used_gpu", False):
-                self.info("使用了GPU加速")
+                lines.append("使用了GPU加速")
 
-        self.info("=" * 50)
+        lines.append("=" * 50)
+        self.info("\n".join(lines))
+        # 会话记录完整落盘
+        self.flush()
 
     def get_log_file_path(self) -> str:
-        """获取当前日志文件路径"""
-        today = datetime.datetime.now().strftime("%Y%m%d")
-        log_filename = f"compress_password_probe_{today}.log"
-        return os.path.join(self.log_directory, log_filename)
+        """获取当前日志文件路径（设置日志记录器时确定，即实际写入的文件）"""
+        return self.log_path
 
     def clear_old_logs(self, days_to_keep: int = 30):
         """清理旧日志文件"""
@@ -112,20 +237,21 @@ class Logger:
             if not os.path.exists(self.log_directory):
                 return
 
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(
-                days=days_to_keep
-            )
-
-            for filename in os.listdir(self.log_directory):
-                if filename.endswith(".log"):
-                    file_path = os.path.join(self.log_directory, filename)
-                    file_time = datetime.datetime.fromtimestamp(
-                        os.path.getctime(file_path)
-                    )
-
-                    if file_time < cutoff_date:
-                        os.remove(file_path)
-                        self.info(f"删除旧日志文件: {filename}")
+            cutoff_ts = (
+                datetime.datetime.now() - datetime.timedelta(days=days_to_keep)
+            ).timestamp()
+
+            # scandir在遍历时带回文件信息，只比较时间戳，先收集再删除
+            with os.scandir(self.log_directory) as entries:
+                old_logs = [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith(".log") and entry.stat().st_ctime < cutoff_ts
+                ]
+
+            for entry in old_logs:
+                os.remove(entry.path)
+                self.info(f"删除旧日志文件: {entry.name}")
 
         except Exception as e:
             self.error(f"清理旧日志文件失败: {str(e)}")
@@ -17,13 +17,19 @@ from PySide6.QtGui import QFont, QPixmap
 from core.gpu_accelerator import GPUManager
 import sys
 import platform
+from importlib import metadata
 
 
 class AboutDialog(QDialog):
     """关于对话框"""
 
-    def __init__(self, parent=None):
+    # 系统信息文本，进程内只收集一次，点击"刷新"时重新收集
+    _SYSTEM_INFO_CACHE = None
+
+    def __init__(self, parent=None, gpu_manager: GPUManager = None):
         super().__init__(parent)
+        # 复用调用方（主窗口）已有的GPU管理器，未提供时在需要时创建
+        self.gpu_manager = gpu_manager
         self.setWindowTitle("关于 CompressPasswordProbe")
         self.setModal(True)
         self.resize(500, 400)
@@ -34,22 +40,23 @@ class AboutDialog(QDialog):
         """初始化UI"""
         layout = QVBoxLayout(self)
 
-        # 创建选项卡
-        tab_widget = QTabWidget()
-
-        # 关于选项卡
-        about_tab = self.create_about_tab()
-        tab_widget.addTab(about_tab, "关于")
+        # 创建选项卡 - 先放空白页，首次切换到该页时才创建内容（系统信息需要探测GPU等，较慢）
+        self.tab_widget = QTabWidget()
+        self._tab_builders = {}
+        for title, builder in (
+            ("关于", self.create_about_tab),
+            ("系统信息", self.create_system_tab),
+            ("许可证", self.create_license_tab),
+        ):
+            placeholder = QWidget()
+            QVBoxLayout(placeholder).setContentsMargins(0, 0, 0, 0)
+            index = self.tab_widget.addTab(placeholder, title)
+            self._tab_builders[index] = builder
 
-        # 系统信息选项卡
-        system_tab = self.create_system_tab()
-        tab_widget.addTab(system_tab, "系统信息")
+        self.tab_widget.currentChanged.connect(self.ensure_tab_built)
+        self.ensure_tab_built(self.tab_widget.currentIndex())
 
-        # 许可证选项卡
-        license_tab = self.create_license_tab()
-        tab_widget.addTab(license_tab, "许可证")
-
-        layout.addWidget(tab_widget)
+        layout.addWidget(self.tab_widget)
 
         # 确定按钮
         button_layout = QHBoxLayout()
@@ -60,29 +67,29 @@ class AboutDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+    def ensure_tab_built(self, index: int):
+        """创建选项卡内容（每页只创建一次）"""
+        builder = self._tab_builders.pop(index, None)
+        if builder is not None:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+
     def create_about_tab(self) -> QWidget:
         """创建关于选项卡"""
         widget = QWidget()
         layout = QVBoxLayout(widget)
 
-        # 应用程序信息
-        app_info = QLabel()
-        app_info.setAlignment(Qt.AlignCenter)
-        app_info.setText(
+        # 应用程序信息、功能特性和技术栈合并为一个标签，只解析和排版一次富文本
+        about_label = QLabel()
+        about_label.setTextFormat(Qt.RichText)
+        about_label.setText(
             """
+        <div align="center">
         <h2>CompressPasswordProbe</h2>
         <h3>压缩文件密码破解工具</h3>
         <p><b>版本:</b> 1.0.0</p>
         <p><b>作者:</b> ZhongYanZhiShi</p>
         <p><b>开发时间:</b> 2024年</p>
-        """
-        )
-        layout.addWidget(app_info)
-
-        # 功能特性
-        features = QLabel()
-        features.setText(
-            """
+        </div>
         <h4>主要功能:</h4>
         <ul>
         <li>支持 ZIP、7Z、RAR 格式压缩文件</li>
@@ -93,14 +100,6 @@ class AboutDialog(QDialog):
         <li>多线程处理</li>
         <li>日志记录</li>
         </ul>
-        """
-        )
-        layout.addWidget(features)
-
-        # 技术栈
-        tech_stack = QLabel()
-        tech_stack.setText(
-            """
         <h4>技术栈:</h4>
         <ul>
         <li>Python 3</li>
@@ -111,7 +110,7 @@ class AboutDialog(QDialog):
         </ul>
         """
         )
-        layout.addWidget(tech_stack)
+        layout.addWidget(about_label)
 
         layout.addStretch()
         return widget
@@ -129,6 +128,15 @@ class AboutDialog(QDialog):
         system_info.setPlainText(info_text)
 
         layout.addWidget(system_info)
+
+        refresh_btn = QPushButton("刷新")
+        refresh_btn.clicked.connect(
+            lambda: system_info.setPlainText(self.get_system_info(refresh=True))
+        )
+        refresh_layout = QHBoxLayout()
+        refresh_layout.addStretch()
+        refresh_layout.addWidget(refresh_btn)
+        layout.addLayout(refresh_layout)
         return widget
 
     def create_license_tab(self) -> QWidget:
@@ -174,62 +182,62 @@ SOFTWARE.
         layout.addWidget(license_text)
         return widget
 
-    def get_system_info(self) -> str:
-        """获取系统信息"""
-        gpu_manager = GPUManager()
+    def get_system_info(self, refresh: bool = False) -> str:
+        """获取系统信息 - 结果缓存在类上，refresh为True时重新探测"""
+        if AboutDialog._SYSTEM_INFO_CACHE is not None and not refresh:
+            return AboutDialog._SYSTEM_INFO_CACHE
+
+        if self.gpu_manager is None:
+            self.gpu_manager = GPUManager()
+        gpu_manager = self.gpu_manager
+        if refresh:
+            gpu_manager.refresh_detection()
         system_info = GPUManager.get_system_info()
 
-        info_lines = [
-            "系统信息",
-            "=" * 50,
-            f"操作系统: {platform.platform()}",
-            f"处理器: {platform.processor()}",
-            f"架构: {platform.architecture()[0]}",
-            f"Python 版本: {sys.version}",
-            "",
-            "GPU 支持",
-            "=" * 50,
-            f"CUDA 可用: {'是' if system_info.get('cuda_available', False) else '否'}",
-            f"OpenCL 可用: {'是' if system_info.get('opencl_available', False) else '否'}",
-            f"Numba CUDA 可用: {'是' if system_info.get('numba_cuda_available', False) else '否'}",
-            f"NVIDIA 驱动: {'是' if system_info.get('nvidia_driver', False) else '否'}",
-            "",
-            "当前 GPU 状态",
-            "=" * 50,
+        def yes_no(key: str) -> str:
+            return "是" if system_info.get(key, False) else "否"
+
+        separator = "=" * 50
+        sections = [
+            f"""系统信息
+{separator}
+操作系统: {system_info.get("platform") or platform.platform()}
+处理器: {system_info.get("processor") or platform.processor()}
+架构: {platform.architecture()[0]}
+Python 版本: {sys.version}
+
+GPU 支持
+{separator}
+CUDA 可用: {yes_no("cuda_available")}
+OpenCL 可用: {yes_no("opencl_available")}
+Numba CUDA 可用: {yes_no("numba_cuda_available")}
+NVIDIA 驱动: {yes_no("nvidia_driver")}
+
+当前 GPU 状态
+{separator}"""
         ]
 
         if gpu_manager.is_gpu_available():
             gpu_info = gpu_manager.get_gpu_info()
-            info_lines.extend(
-                [
-                    f"GPU 设备: 可用",
-                    f"设备名称: {gpu_info.get('name', '未知')}",
-                    f"设备类型: {gpu_info.get('type', '未知')}",
-                ]
+            sections.append(
+                f"GPU 设备: 可用\n"
+                f"设备名称: {gpu_info.get('name', '未知')}\n"
+                f"设备类型: {gpu_info.get('type', '未知')}"
             )
-
-            if "total_memory" in gpu_info:
-                memory_gb = gpu_info["total_memory"] / (1024**3)
-                info_lines.append(f"显存: {memory_gb:.1f} GB")
-
-            if "compute_capability" in gpu_info:
-                info_lines.append(f"计算能力: {gpu_info['compute_capability']}")
-
-            if "multiprocessor_count" in gpu_info:
-                info_lines.append(f"多处理器数量: {gpu_info['multiprocessor_count']}")
+            total_memory = gpu_info.get("total_memory")
+            if total_memory is not None:
+                sections.append(f"显存: {total_memory / (1024**3):.1f} GB")
+            compute_capability = gpu_info.get("compute_capability")
+            if compute_capability is not None:
+                sections.append(f"计算能力: {compute_capability}")
+            multiprocessor_count = gpu_info.get("multiprocessor_count")
+            if multiprocessor_count is not None:
+                sections.append(f"多处理器数量: {multiprocessor_count}")
         else:
-            info_lines.append("GPU 设备: 不可用")
-
-        info_lines.extend(
-            [
-                "",
-                "已安装的 Python 包",
-                "=" * 50,
-            ]
-        )
+            sections.append("GPU 设备: 不可用")
 
         # 检查重要包的版本
-        packages = [
+        packages = (
             "PySide6",
             "py7zr",
             "rarfile",
@@ -237,45 +245,20 @@ SOFTWARE.
             "pyopencl",
             "numba",
             "psutil",
-        ]
+        )
 
-        for package in packages:
+        # 只读取安装元数据，不导入包本身（导入pycuda/pyopencl等会初始化驱动）
+        package_lines = [""] * len(packages)
+        for i, package in enumerate(packages):
             try:
-                if package == "PySide6":
-                    import PySide6
-
-                    version = PySide6.__version__
-                elif package == "py7zr":
-                    import py7zr
-
-                    version = py7zr.__version__
-                elif package == "rarfile":
-                    import rarfile
-
-                    version = getattr(rarfile, "__version__", "未知")
-                elif package == "pycuda":
-                    import pycuda
-
-                    version = pycuda.VERSION_TEXT
-                elif package == "pyopencl":
-                    import pyopencl
-
-                    version = pyopencl.VERSION_TEXT
-                elif package == "numba":
-                    import numba
-
-                    version = numba.__version__
-                elif package == "psutil":
-                    import psutil
-
-                    version = psutil.__version__
-                else:
-                    version = "未知"
-
-                info_lines.append(f"{package}: {version}")
-            except ImportError:
-                info_lines.append(f"{package}: 未安装")
+                package_lines[i] = f"{package}: {metadata.version(package)}"
+            except metadata.PackageNotFoundError:
+                package_lines[i] = f"{package}: 未安装"
             except Exception as e:
-                info_lines.append(f"{package}: 错误 ({str(e)})")
+                package_lines[i] = f"{package}: 错误 ({str(e)})"
+
+        sections.append(f"\n已安装的 Python 包\n{separator}")
+        sections.extend(package_lines)
 
-        return "\n".join(info_lines)
+        AboutDialog._SYSTEM_INFO_CACHE = "\n".join(sections)
+        return AboutDialog._SYSTEM_INFO_CACHE
@@ -4,16 +4,20 @@
 
 import os
 import sys
+import time
+from collections import deque
+from typing import Optional
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QGridLayout,
+    QFormLayout,
     QLabel,
     QPushButton,
     QLineEdit,
-    QTextEdit,
+    QPlainTextEdit,
     QProgressBar,
     QGroupBox,
     QCheckBox,
@@ -21,15 +25,21 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QFrame,
     QApplication,
+    QToolTip,
 )
-from PySide6.QtCore import Qt, QTimer, Signal
-from PySide6.QtGui import QDragEnterEvent, QDropEvent, QTextCursor
+from PySide6.QtCore import (
+    QElapsedTimer,
+    QObject,
+    QRect,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QCursor, QDragEnterEvent, QDropEvent
 
 from core.config import Config
-from core.archive_handler import ArchiveManager
-from core.dictionary import DictionaryReader, DictionaryManager
-from core.crack_engine import PasswordCrackEngine
-from core.gpu_accelerator import GPUManager
 from core.logger import get_logger
 
 
@@ -49,6 +59,7 @@ class DropArea(QFrame):
         self.label = QLabel(
             "拖放压缩文件到此处\n支持格式: ZIP, 7Z, RAR\n支持分卷压缩包"
         )
+        self.label.setTextFormat(Qt.PlainText)
         self.label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.label)
         self.setLayout(layout)
@@ -64,19 +75,91 @@ class DropArea(QFrame):
             self.file_dropped.emit(file_path)
 
 
+class GPUProbeTask(QRunnable):
+    """在线程池中创建GPUManager（探测CUDA/OpenCL驱动可能需要数秒），完成后通过信号返回"""
+
+    class Signals(QObject):
+        finished = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.signals = GPUProbeTask.Signals()
+
+    def run(self):
+        from core.gpu_accelerator import GPUManager
+
+        try:
+            gpu_manager = GPUManager()
+        except Exception as e:
+            print(f"GPU检测失败: {e}")
+            gpu_manager = None
+        self.signals.finished.emit(gpu_manager)
+
+
+class DictionaryValidateTask(QRunnable):
+    """在线程池中验证字典（统计密码数量需要扫描整个文件），完成后通过信号返回结果"""
+
+    class Signals(QObject):
+        finished = Signal(str, object)  # 字典路径, 验证结果
+
+    def __init__(self, dictionary_path: str):
+        super().__init__()
+        self.dictionary_path = dictionary_path
+        self.signals = DictionaryValidateTask.Signals()
+
+    def run(self):
+        from core.dictionary import DictionaryReader
+
+        try:
+            result = DictionaryReader(self.dictionary_path).validate_dictionary()
+        except Exception as e:
+            result = {"valid": False, "error": str(e)}
+        self.signals.finished.emit(self.dictionary_path, result)
+
+
 class MainWindow(QMainWindow):
     """主窗口类"""
 
+    # 日志区刷新间隔（毫秒）- 期间的日志合并为一次插入，避免逐条重新排版
+    LOG_FLUSH_INTERVAL_MS = 50
+    # 日志区默认最多保留的行数（配置项max_log_lines），超出后自动丢弃最早的行
+    MAX_LOG_LINES = 5000
+    # Linux上的原生文件对话框可能长时间阻塞事件循环，默认改用Qt自带的对话框
+    # （配置项native_file_dialog可覆盖）
+    NATIVE_FILE_DIALOG = not sys.platform.startswith("linux")
+    # 配置中缓存密码数量的字典个数上限
+    DICTIONARY_COUNT_CACHE_SIZE = 20
+
     def __init__(self, config: Config):
         super().__init__()
         self.config = config
-        self.archive_manager = ArchiveManager()
-        self.crack_engine = PasswordCrackEngine(config.config)
-        self.gpu_manager = GPUManager()
+        # 核心模块（压缩包解析、破解引擎、GPU探测）在首次使用时才导入和创建，窗口先显示
+        self._archive_manager = None
+        self._crack_engine = None
+        self._gpu_manager = None
+        self._gpu_probe_task = None
         self.logger = get_logger()
 
         self.current_archive_path = ""
         self.current_dictionary_path = ""
+        # 已通过验证的字典路径，开始破解时未验证的字典先验证
+        self._validated_dictionary_path = ""
+        # 正在后台验证的字典任务，以及验证通过后是否自动开始破解
+        self._validation_task = None
+        self._start_after_validation = False
+        # 破解成功对话框，首次找到密码时创建
+        self._found_msg_box = None
+        self._found_copy_button = None
+
+        # 待写入日志区的消息队列，由单次定时器批量写入；没有新消息时定时器不运行
+        self._log_queue = deque()
+        # 日志时间戳按秒缓存，同一秒内的日志复用同一个字符串
+        self._last_log_second = 0
+        self._last_log_timestamp = ""
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self.flush_log_buffer)
 
         self.setWindowTitle("CompressPasswordProbe - 压缩文件密码破解工具")
         self.setMinimumSize(800, 600)
@@ -84,11 +167,50 @@ class MainWindow(QMainWindow):
 
         self.init_ui()
         self.connect_signals()
-        self.load_last_paths()
-        self.check_gpu_status()
+        # 加载上次的文件和检查GPU需要解析压缩包、探测驱动，放到窗口显示之后
+        QTimer.singleShot(0, self.load_last_paths)
+        QTimer.singleShot(0, self.probe_gpu_async)
+
+    @property
+    def archive_manager(self):
+        """压缩文件管理器"""
+        if self._archive_manager is None:
+            from core.archive_handler import ArchiveManager
+
+            self._archive_manager = ArchiveManager()
+        return self._archive_manager
+
+    @property
+    def crack_engine(self):
+        """密码破解引擎 - 创建时连接信号"""
+        if self._crack_engine is None:
+            from core.crack_engine import PasswordCrackEngine
+
+            self._crack_engine = PasswordCrackEngine(self.config.config)
+            self._crack_engine.progress_updated.connect(self.update_progress)
+            self._crack_engine.password_found.connect(self.on_password_found)
+            self._crack_engine.crack_finished.connect(self.on_crack_finished)
+        return self._crack_engine
+
+    @property
+    def gpu_manager(self):
+        """GPU管理器"""
+        if self._gpu_manager is None:
+            from core.gpu_accelerator import GPUManager
+
+            self._gpu_manager = GPUManager()
+        return self._gpu_manager
 
     def init_ui(self):
-        """初始化用户界面"""
+        """初始化用户界面 - 构建期间暂停重绘，全部控件创建完后统一排版一次"""
+        self.setUpdatesEnabled(False)
+        try:
+            self._build_ui()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _build_ui(self):
+        """创建各区域控件"""
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
 
@@ -160,6 +282,7 @@ class MainWindow(QMainWindow):
         self.gpu_checkbox = QCheckBox("启用GPU加速")
         self.gpu_checkbox.setChecked(self.config.get("gpu_acceleration", False))
         self.gpu_status_label = QLabel("GPU状态: 检测中...")
+        self.gpu_status_label.setTextFormat(Qt.PlainText)
         layout.addWidget(self.gpu_checkbox, 0, 0)
         layout.addWidget(self.gpu_status_label, 0, 1)
 
@@ -190,25 +313,26 @@ class MainWindow(QMainWindow):
         group = QGroupBox("破解进度")
         layout = QVBoxLayout(group)
 
-        # 进度信息
-        info_layout = QGridLayout()
-        info_layout.addWidget(QLabel("当前密码:"), 0, 0)
+        # 进度信息 - 标签/数值成对排列，用一个表单布局
+        info_layout = QFormLayout()
         self.current_password_label = QLabel("-")
-        info_layout.addWidget(self.current_password_label, 0, 1)
-
-        info_layout.addWidget(QLabel("进度:"), 1, 0)
         self.progress_label = QLabel("0 / 0")
-        info_layout.addWidget(self.progress_label, 1, 1)
-
-        info_layout.addWidget(QLabel("速度:"), 2, 0)
         self.speed_label = QLabel("0 passwords/sec")
-        info_layout.addWidget(self.speed_label, 2, 1)
+        info_layout.addRow("当前密码:", self.current_password_label)
+        info_layout.addRow("进度:", self.progress_label)
+        info_layout.addRow("速度:", self.speed_label)
+
+        # 这些标签频繁更新，固定为纯文本，setText时不再检测富文本；
+        # 字典中形如"<b>..."的密码也会按原样显示
+        for label in (self.current_password_label, self.progress_label, self.speed_label):
+            label.setTextFormat(Qt.PlainText)
 
         layout.addLayout(info_layout)
 
         # 进度条
         self.progress_bar = QProgressBar()
-        self.progress_bar.setTextVisible(True)
+        # 百分比显示在进度标签中，进度条本身不绘制文字
+        self.progress_bar.setTextVisible(False)
         layout.addWidget(self.progress_bar)
 
         # 找到的密码区域
@@ -233,25 +357,48 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(group)
 
         # 日志文本区域
-        self.log_text = QTextEdit()
+        # 纯文本日志区按块存储，超过行数上限时丢弃最早的行，追加开销不随历史增长
+        self.log_text = QPlainTextEdit()
         self.log_text.setMinimumHeight(100)  # 设置最小高度
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(
+            self.config.get("max_log_lines", self.MAX_LOG_LINES)
+        )
         layout.addWidget(self.log_text)
 
         return group
 
     def connect_signals(self):
-        """连接信号"""
-        self.crack_engine.progress_updated.connect(self.update_progress)
-        self.crack_engine.password_found.connect(self.on_password_found)
-        self.crack_engine.crack_finished.connect(self.on_crack_finished)
-        self.crack_engine.speed_updated.connect(self.update_speed)
-
+        """连接信号（破解引擎的信号在创建引擎时连接）"""
         self.gpu_checkbox.stateChanged.connect(self.on_gpu_setting_changed)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_elapsed_time)
-        self.start_time = 0
+        # 破解开始后的单调计时，未开始时无效；耗时随进度更新按需显示，不单独设定时器
+        self._elapsed = QElapsedTimer()
+        self._shown_elapsed_seconds = -1
+        # 进度标签上当前显示的值，未变化时不更新
+        self._shown_current = -1
+        self._shown_speed = -1.0
+
+    def schedule_config_save(self):
+        """延迟保存配置，短时间内的多次修改合并为一次写入"""
+        self.config.mark_dirty()
+
+    def set_config_value(self, key: str, value):
+        """修改配置项，值有变化时才安排保存"""
+        if self.config.set(key, value):
+            self.schedule_config_save()
+
+    def closeEvent(self, event):
+        """关闭窗口时立即写入尚未保存的配置和日志"""
+        self.config.flush_if_dirty()
+        self.flush_log_buffer()
+        super().closeEvent(event)
+
+    def _file_dialog_options(self) -> dict:
+        """文件对话框的附加参数 - 不使用原生对话框时由Qt自行处理模态，引擎信号照常送达"""
+        if self.config.get("native_file_dialog", self.NATIVE_FILE_DIALOG):
+            return {}
+        return {"options": QFileDialog.DontUseNativeDialog}
 
     def browse_archive_file(self):
         """浏览压缩文件"""
@@ -260,6 +407,7 @@ class MainWindow(QMainWindow):
             "选择压缩文件",
             self.config.get("last_archive_path", ""),
             self.archive_manager.get_supported_formats_filter(),
+            **self._file_dialog_options(),
         )
 
         if file_path:
@@ -275,10 +423,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "不支持的文件格式")
             return
 
-        self.current_archive_path = file_path
-        self.archive_path_edit.setText(file_path)
-        self.config.set("last_archive_path", file_path)
-        self.config.save_config()
+        self._set_archive_path(file_path)
 
         info = self.archive_manager.get_archive_info(file_path)
         if "error" not in info:
@@ -299,6 +444,13 @@ class MainWindow(QMainWindow):
         else:
             self.log_message(f"加载文件失败: {info['error']}")
 
+    def _set_archive_path(self, file_path: str, save: bool = True):
+        """设置当前压缩文件路径（不读取压缩包信息）"""
+        self.current_archive_path = file_path
+        self.archive_path_edit.setText(file_path)
+        if save:
+            self.set_config_value("last_archive_path", file_path)
+
     def browse_dictionary_file(self):
         """浏览字典文件"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -306,6 +458,7 @@ class MainWindow(QMainWindow):
             "选择字典文件",
             self.config.get("last_dictionary_path", ""),
             "文本文件 (*.txt);;所有文件 (*.*)",
+            **self._file_dialog_options(),
         )
 
         if file_path:
@@ -317,30 +470,114 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "字典文件不存在")
             return
 
+        self._set_dictionary_path(file_path)
+        self._validate_dictionary()
+
+    def _set_dictionary_path(self, file_path: str, save: bool = True):
+        """设置当前字典路径（不读取字典内容）"""
         self.current_dictionary_path = file_path
         self.dict_path_edit.setText(file_path)
-        self.config.set("last_dictionary_path", file_path)
-        self.config.save_config()
+        if save:
+            self.set_config_value("last_dictionary_path", file_path)
+
+    def _validate_dictionary(self, start_when_valid: bool = False):
+        """在后台线程验证当前字典，结果由on_dictionary_validated处理
+
+        Args:
+            start_when_valid: 验证通过后是否自动开始破解
+        """
+        file_path = self.current_dictionary_path
+        self._start_after_validation = start_when_valid
+        task = self._validation_task
+        if task is not None and task.dictionary_path == file_path:
+            # 同一字典的验证已在进行中
+            return
 
-        dictionary_reader = DictionaryReader(file_path)
-        validation_result = dictionary_reader.validate_dictionary()
+        # 文件未变化时直接使用上次统计的密码数量，不再扫描
+        cached_count = self._cached_dictionary_count(file_path)
+        if cached_count is not None:
+            self.on_dictionary_validated(
+                file_path,
+                {"valid": True, "error": None, "password_count": cached_count},
+            )
+            return
+
+        task = DictionaryValidateTask(file_path)
+        task.signals.finished.connect(self.on_dictionary_validated)
+        self._validation_task = task
+        self.statusBar().showMessage("正在验证字典...")
+        QThreadPool.globalInstance().start(task)
+
+    def on_dictionary_validated(self, file_path: str, validation_result: dict):
+        """后台字典验证完成"""
+        task = self._validation_task
+        if task is not None and task.dictionary_path == file_path:
+            self._validation_task = None
+        if file_path != self.current_dictionary_path:
+            # 验证期间用户又选择了其他字典
+            return
+
+        start_crack = self._start_after_validation
+        self._start_after_validation = False
+        self.statusBar().showMessage("就绪")
 
         if validation_result["valid"]:
+            self._validated_dictionary_path = file_path
+            self._remember_dictionary_count(file_path, validation_result["password_count"])
             self.log_message(f"已加载字典文件: {os.path.basename(file_path)}")
             self.log_message(f"密码数量: {validation_result['password_count']}")
-        else:
-            self.log_message(f"字典文件验证失败: {validation_result['error']}")
-            QMessageBox.warning(
-                self, "错误", f"字典文件无效: {validation_result['error']}"
-            )
+            if start_crack:
+                self.start_crack()
+            return
+
+        self._validated_dictionary_path = ""
+        error = validation_result["error"] or "字典中没有密码"
+        self.log_message(f"字典文件验证失败: {error}")
+        QMessageBox.warning(self, "错误", f"字典文件无效: {error}")
+
+    @staticmethod
+    def _dictionary_signature(file_path: str) -> Optional[list]:
+        """字典文件的 [修改时间(纳秒), 大小]，用于判断缓存的密码数量是否仍有效"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _cached_dictionary_count(self, file_path: str) -> Optional[int]:
+        """查找配置中缓存的字典密码数量，文件已变化时返回None"""
+        entry = self.config.get("dictionary_count_cache", {}).get(file_path)
+        signature = self._dictionary_signature(file_path)
+        if entry is None or signature is None or entry[:2] != signature:
+            return None
+        return entry[2]
+
+    def _remember_dictionary_count(self, file_path: str, password_count: int):
+        """把字典的密码数量缓存到配置中（只保留最近的若干个字典）"""
+        signature = self._dictionary_signature(file_path)
+        if signature is None:
+            return
+        # 复制后修改，不改动默认配置中共享的字典
+        cache = dict(self.config.get("dictionary_count_cache", {}))
+        cache.pop(file_path, None)
+        cache[file_path] = signature + [password_count]
+        while len(cache) > self.DICTIONARY_COUNT_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        self.set_config_value("dictionary_count_cache", cache)
 
     def create_sample_dictionary(self):
         """创建示例字典"""
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "保存示例字典", "sample_dictionary.txt", "文本文件 (*.txt)"
+            self,
+            "保存示例字典",
+            "sample_dictionary.txt",
+            "文本文件 (*.txt)",
+            **self._file_dialog_options(),
         )
 
         if file_path:
+            from core.dictionary import DictionaryManager
+
             passwords = DictionaryManager.get_common_passwords()
             if DictionaryManager.create_sample_dictionary(file_path, passwords):
                 QMessageBox.information(self, "成功", f"示例字典已创建: {file_path}")
@@ -358,8 +595,12 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "请先选择字典文件")
             return
 
-        self.config.set("gpu_acceleration", self.gpu_checkbox.isChecked())
-        self.config.save_config()
+        # 启动时恢复的字典尚未验证，先在后台验证，通过后再开始
+        if self._validated_dictionary_path != self.current_dictionary_path:
+            self._validate_dictionary(start_when_valid=True)
+            return
+
+        self.set_config_value("gpu_acceleration", self.gpu_checkbox.isChecked())
 
         if self.crack_engine.start_crack(
             self.current_archive_path, self.current_dictionary_path
@@ -371,10 +612,8 @@ class MainWindow(QMainWindow):
             self.log_message("开始密码破解...")
             self.statusBar().showMessage("正在破解...")
 
-            import time
-
-            self.start_time = time.time()
-            self.timer.start(1000)
+            self._elapsed.start()
+            self._shown_elapsed_seconds = -1
         else:
             QMessageBox.warning(self, "错误", "启动破解失败")
 
@@ -384,12 +623,10 @@ class MainWindow(QMainWindow):
             if self.crack_engine.is_paused():
                 self.crack_engine.resume_crack()
                 self.pause_btn.setText("暂停")
-                self.timer.start(1000)
                 self.log_message("恢复密码破解")
             else:
                 self.crack_engine.pause_crack()
                 self.pause_btn.setText("恢复")
-                self.timer.stop()
                 self.log_message("暂停密码破解")
 
     def stop_crack(self):
@@ -408,34 +645,50 @@ class MainWindow(QMainWindow):
         self.current_password_label.setText("-")
         self.progress_label.setText("0 / 0")
         self.speed_label.setText("0 passwords/sec")
+        self._shown_current = -1
+        self._shown_speed = -1.0
         self.found_password_edit.clear()
         self.copy_password_btn.setEnabled(False)
-        self.timer.stop()
+        self._elapsed.invalidate()
         self.statusBar().showMessage("就绪")
 
-    def update_progress(self, current: int, total: int, password: str):
-        """更新进度"""
-        self.current_password_label.setText(password)
-        self.progress_label.setText(f"{current} / {total}")
+    def update_progress(self, summary: tuple):
+        """更新进度 - 引擎约每100毫秒发送一次 (当前, 总数, 密码, 速度)
 
-        if total > 0:
-            progress = int((current / total) * 100)
-            self.progress_bar.setValue(progress)
+        速度约每秒才变化一次，进度在暂停时不变，值未变化的标签不重新格式化和设置。
+        """
+        current, total, password, speed = summary
+
+        self.current_password_label.setText(password)
+        if speed != self._shown_speed:
+            self._shown_speed = speed
+            self.speed_label.setText(f"{speed:.1f} passwords/sec")
+
+        if current != self._shown_current:
+            self._shown_current = current
+            if total > 0:
+                progress = int((current / total) * 100)
+                self.progress_label.setText(f"{current} / {total} ({progress}%)")
+                if progress != self.progress_bar.value():
+                    self.progress_bar.setValue(progress)
+            else:
+                self.progress_label.setText(f"{current} / {total}")
 
-    def update_speed(self, speed: float):
-        """更新速度"""
-        self.speed_label.setText(f"{speed:.1f} passwords/sec")
+        self.update_elapsed_time()
 
     def update_elapsed_time(self):
-        """更新耗时"""
-        if self.start_time > 0:
-            import time
-
-            elapsed = int(time.time() - self.start_time)
-            hours = elapsed // 3600
-            minutes = (elapsed % 3600) // 60
-            seconds = elapsed % 60
-            # 可以添加时间显示标签
+        """在状态栏显示耗时 - 由进度更新调用，秒数变化时才刷新"""
+        if not self._elapsed.isValid():
+            return
+        elapsed = self._elapsed.elapsed() // 1000
+        if elapsed == self._shown_elapsed_seconds:
+            return
+        self._shown_elapsed_seconds = elapsed
+        hours, remainder = divmod(elapsed, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        self.statusBar().showMessage(
+            f"正在破解... 已用时 {hours:02d}:{minutes:02d}:{seconds:02d}"
+        )
 
     def on_password_found(self, password: str, attempts: int, elapsed_time: float):
         """密码找到回调"""
@@ -448,24 +701,31 @@ class MainWindow(QMainWindow):
         self.found_password_edit.setText(password)
         self.copy_password_btn.setEnabled(True)
 
-        # 创建自定义消息框，包含复制按钮
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("破解成功")
+        self._show_found_dialog(password, attempts, elapsed_time)
+
+    def _show_found_dialog(self, password: str, attempts: int, elapsed_time: float):
+        """显示破解成功对话框 - 对话框和按钮只创建一次，之后只更新文字"""
+        if self._found_msg_box is None:
+            msg_box = QMessageBox(self)
+            msg_box.setWindowTitle("破解成功")
+            msg_box.setIcon(QMessageBox.Information)
+            # 密码按原样显示，不解析为富文本
+            msg_box.setTextFormat(Qt.PlainText)
+            # 添加复制按钮
+            self._found_copy_button = msg_box.addButton("复制密码", QMessageBox.ActionRole)
+            msg_box.addButton(QMessageBox.Ok)
+            self._found_msg_box = msg_box
+
+        msg_box = self._found_msg_box
         msg_box.setText(
             f"找到密码: {password}\n\n"
             f"尝试次数: {attempts}\n"
             f"耗时: {elapsed_time:.2f} 秒"
         )
-        msg_box.setIcon(QMessageBox.Information)
-
-        # 添加复制按钮
-        copy_button = msg_box.addButton("复制密码", QMessageBox.ActionRole)
-        ok_button = msg_box.addButton(QMessageBox.Ok)
-
         msg_box.exec()
 
         # 检查用户点击的按钮
-        if msg_box.clickedButton() == copy_button:
+        if msg_box.clickedButton() == self._found_copy_button:
             self.copy_password_to_clipboard(password)
 
     def copy_password_to_clipboard(self, password: str):
@@ -473,12 +733,10 @@ class MainWindow(QMainWindow):
         clipboard = QApplication.clipboard()
         clipboard.setText(password)
 
-        # 显示复制成功的提示
+        # 显示复制成功的提示 - 状态栏和短暂的提示文字，不再弹出第二个模态对话框
         self.log_message(f"密码已复制到剪贴板: {password}")
         self.statusBar().showMessage("密码已复制到剪贴板", 3000)  # 显示3秒
-
-        # 可选：显示简短的提示消息
-        QMessageBox.information(self, "复制成功", f"密码 '{password}' 已复制到剪贴板")
+        QToolTip.showText(QCursor.pos(), "已复制", self, QRect(), 1500)
 
     def copy_found_password(self):
         """复制找到的密码到剪贴板"""
@@ -503,7 +761,25 @@ class MainWindow(QMainWindow):
 
     def on_gpu_setting_changed(self, state: int):
         """GPU设置变化"""
-        self.config.set("gpu_acceleration", state == Qt.Checked)
+        self.set_config_value("gpu_acceleration", state == Qt.Checked)
+
+    def probe_gpu_async(self):
+        """在后台线程探测GPU，结果回到界面线程后更新GPU状态"""
+        if self._gpu_manager is not None:
+            self.check_gpu_status()
+            return
+        task = GPUProbeTask()
+        # 信号对象属于界面线程，槽函数在界面线程执行
+        task.signals.finished.connect(self.on_gpu_probed)
+        self._gpu_probe_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def on_gpu_probed(self, gpu_manager):
+        """后台GPU探测完成"""
+        self._gpu_probe_task = None
+        if self._gpu_manager is None and gpu_manager is not None:
+            self._gpu_manager = gpu_manager
+        self.check_gpu_status()
 
     def check_gpu_status(self):
         """检查GPU状态"""
@@ -515,30 +791,51 @@ class MainWindow(QMainWindow):
         else:
             self.gpu_status_label.setText("GPU状态: 不可用")
             self.gpu_checkbox.setEnabled(False)
+            # 只改显示，不触发on_gpu_setting_changed覆盖用户保存的GPU设置
+            self.gpu_checkbox.blockSignals(True)
             self.gpu_checkbox.setChecked(False)
+            self.gpu_checkbox.blockSignals(False)
 
     def load_last_paths(self):
         """加载上次的文件路径"""
         last_archive = self.config.get("last_archive_path", "")
         last_dict = self.config.get("last_dictionary_path", "")
 
-        if last_archive and os.path.exists(last_archive):
-            self.load_archive_file(last_archive)
+        # 启动时只恢复路径，不读取压缩包信息和扫描字典，字典在开始破解时验证
+        if (
+            last_archive
+            and os.path.exists(last_archive)
+            and self.archive_manager.is_supported(last_archive)
+        ):
+            self._set_archive_path(last_archive, save=False)
+            self.log_message(f"已恢复上次的压缩文件: {os.path.basename(last_archive)}")
 
         if last_dict and os.path.exists(last_dict):
-            self.load_dictionary_file(last_dict)
+            self._set_dictionary_path(last_dict, save=False)
+            self.log_message(f"已恢复上次的字典文件: {os.path.basename(last_dict)}")
 
     def log_message(self, message: str):
         """添加日志消息"""
-        import datetime
+        now = int(time.time())
+        if now != self._last_log_second:
+            self._last_log_second = now
+            self._last_log_timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+        self._log_queue.append(f"[{self._last_log_timestamp}] {message}")
+        self.logger.info(message)
 
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
 
-        self.log_text.append(formatted_message)
-        self.logger.info(message)
+    def flush_log_buffer(self):
+        """把缓存的日志消息一次写入日志区"""
+        if not self._log_queue:
+            return
+        # 用户正在查看历史日志时不跳到底部
+        scroll_bar = self.log_text.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+
+        self.log_text.appendPlainText("\n".join(self._log_queue))
+        self._log_queue.clear()
 
-        # 自动滚动到底部
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.log_text.setTextCursor(cursor)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
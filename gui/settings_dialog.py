@@ -19,18 +19,91 @@ from PySide6.QtWidgets import (
     QTextEdit,
     QComboBox,
 )
-from PySide6.QtCore import Qt
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QSignalBlocker, Qt, QThreadPool, Signal
 from core.config import Config
-from core.gpu_accelerator import GPUManager
+
+if TYPE_CHECKING:
+    from core.gpu_accelerator import GPUManager
+
+
+# GPU检测结果快照的有效期（秒），期间再次打开设置对话框直接使用快照
+_GPU_SNAPSHOT_TTL = 60.0
+# 所有设置对话框共享的GPU检测结果快照和GPU管理器
+_gpu_snapshot_cache: Dict[str, Any] = {"ts": 0.0, "data": None}
+_shared_gpu_manager: Optional["GPUManager"] = None
+_shared_gpu_manager_lock = threading.Lock()
+
+
+def _get_shared_gpu_manager() -> "GPUManager":
+    """获取设置对话框共用的GPU管理器，首次使用时导入并创建（可在后台线程中调用）"""
+    global _shared_gpu_manager
+    with _shared_gpu_manager_lock:
+        if _shared_gpu_manager is None:
+            from core.gpu_accelerator import GPUManager
+
+            _shared_gpu_manager = GPUManager()
+        return _shared_gpu_manager
+
+
+def _collect_gpu_snapshot(gpu_manager: "GPUManager", force: bool) -> Dict[str, Any]:
+    """探测GPU并汇总为快照（可能需要数秒，在后台线程中调用）"""
+    if force:
+        gpu_manager.refresh_detection()
+    return {
+        "available": gpu_manager.is_gpu_available(),
+        "gpu_info": dict(gpu_manager.get_gpu_info()),
+        "system_info": gpu_manager.get_system_info(),
+    }
+
+
+class GPUSnapshotTask(QRunnable):
+    """在线程池中收集GPU检测结果快照，完成后通过信号返回
+
+    未提供GPU管理器时在后台线程中获取共享实例，完成后可从gpu_manager属性取得。
+    """
+
+    class Signals(QObject):
+        finished = Signal(object)
+
+    def __init__(self, gpu_manager: Optional["GPUManager"], force: bool):
+        super().__init__()
+        self.gpu_manager = gpu_manager
+        self.force = force
+        self.signals = GPUSnapshotTask.Signals()
+
+    def run(self):
+        try:
+            if self.gpu_manager is None:
+                self.gpu_manager = _get_shared_gpu_manager()
+            snapshot = _collect_gpu_snapshot(self.gpu_manager, self.force)
+        except Exception as e:
+            print(f"GPU检测失败: {e}")
+            snapshot = None
+        self.signals.finished.emit(snapshot)
 
 
 class SettingsDialog(QDialog):
     """设置对话框"""
 
-    def __init__(self, config: Config, parent=None):
+    # 两次手动刷新GPU信息的最小间隔（秒），避免连续点击反复查询驱动
+    MIN_REFRESH_INTERVAL = 2.0
+
+    def __init__(self, config: Config, parent=None, gpu_manager: "GPUManager" = None):
         super().__init__(parent)
         self.config = config
-        self.gpu_manager = GPUManager()
+        # 复用调用方的GPU管理器；未提供时在首次探测GPU时使用共享实例
+        self.gpu_manager = gpu_manager
+        # 后台GPU探测任务，进行中时刷新按钮不可用
+        self._probe_task = None
+        self._last_refresh_ts = 0.0
+        # 加载设置时的控件值；点击重置后即使控件值未变也需要保存
+        self._loaded_snapshot: Dict[str, Any] = {}
+        self._reset_pending = False
 
         self.setWindowTitle("设置")
         self.setModal(True)
@@ -54,9 +127,11 @@ class SettingsDialog(QDialog):
         performance_tab = self.create_performance_tab()
         tab_widget.addTab(performance_tab, "性能")
 
-        # GPU设置选项卡
+        # GPU设置选项卡 - GPU信息在首次切换到该页时才检测
         gpu_tab = self.create_gpu_tab()
-        tab_widget.addTab(gpu_tab, "GPU")
+        self._gpu_tab_index = tab_widget.addTab(gpu_tab, "GPU")
+        self._gpu_info_loaded = False
+        tab_widget.currentChanged.connect(self._on_tab_changed)
 
         # 日志设置选项卡
         log_tab = self.create_log_tab()
@@ -190,15 +265,12 @@ class SettingsDialog(QDialog):
         info_layout.addWidget(self.gpu_info_text)
 
         # 刷新GPU信息按钮
-        refresh_btn = QPushButton("刷新GPU信息")
-        refresh_btn.clicked.connect(self.refresh_gpu_info)
-        info_layout.addWidget(refresh_btn)
+        self.refresh_gpu_btn = QPushButton("刷新GPU信息")
+        self.refresh_gpu_btn.clicked.connect(self.on_refresh_clicked)
+        info_layout.addWidget(self.refresh_gpu_btn)
 
         layout.addWidget(info_group)
 
-        # 加载GPU信息
-        self.refresh_gpu_info()
-
         layout.addStretch()
         return widget
 
@@ -233,86 +305,212 @@ class SettingsDialog(QDialog):
 
     def load_settings(self):
         """加载设置"""
-        # 常规设置
-        self.max_attempts_spin.setValue(self.config.get("max_attempts", 0))
-        self.timeout_spin.setValue(self.config.get("timeout_seconds", 0))
-
-        language = self.config.get("ui_language", "zh_CN")
-        if language == "zh_CN":
-            self.language_combo.setCurrentIndex(0)
-        else:
-            self.language_combo.setCurrentIndex(1)
-
-        # 性能设置
-        self.max_threads_spin.setValue(self.config.get("max_threads", 4))
-        self.batch_size_spin.setValue(self.config.get("batch_size", 1000))
-
-        # GPU设置
-        self.gpu_acceleration_cb.setChecked(self.config.get("gpu_acceleration", False))
-        self.auto_detect_gpu_cb.setChecked(self.config.get("auto_detect_gpu", True))
-
-        # 日志设置
-        self.save_log_cb.setChecked(self.config.get("save_log", True))
-        self.log_directory_edit.setText(self.config.get("log_directory", "logs"))
-
-    def apply_settings(self):
-        """应用设置"""
-        # 常规设置
-        self.config.set("max_attempts", self.max_attempts_spin.value())
-        self.config.set("timeout_seconds", self.timeout_spin.value())
+        values = self.config.get_many(
+            {
+                "max_attempts": 0,
+                "timeout_seconds": 0,
+                "ui_language": "zh_CN",
+                "max_threads": 4,
+                "batch_size": 1000,
+                "gpu_acceleration": False,
+                "auto_detect_gpu": True,
+                "save_log": True,
+                "log_directory": "logs",
+            }
+        )
 
+        # 填充控件期间屏蔽其信号，避免逐个触发连接的处理函数
+        blockers = [
+            QSignalBlocker(widget)
+            for widget in (
+                self.max_attempts_spin,
+                self.timeout_spin,
+                self.language_combo,
+                self.max_threads_spin,
+                self.batch_size_spin,
+                self.gpu_acceleration_cb,
+                self.auto_detect_gpu_cb,
+                self.save_log_cb,
+                self.log_directory_edit,
+            )
+        ]
+        try:
+            # 常规设置
+            self.max_attempts_spin.setValue(values["max_attempts"])
+            self.timeout_spin.setValue(values["timeout_seconds"])
+            self.language_combo.setCurrentIndex(
+                0 if values["ui_language"] == "zh_CN" else 1
+            )
+
+            # 性能设置
+            self.max_threads_spin.setValue(values["max_threads"])
+            self.batch_size_spin.setValue(values["batch_size"])
+
+            # GPU设置
+            self.gpu_acceleration_cb.setChecked(values["gpu_acceleration"])
+            self.auto_detect_gpu_cb.setChecked(values["auto_detect_gpu"])
+
+            # 日志设置
+            self.save_log_cb.setChecked(values["save_log"])
+            self.log_directory_edit.setText(values["log_directory"])
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+
+        # 加载时的控件值，应用时只写入有改动的项
+        self._loaded_snapshot = self._collect_settings()
+
+    def _collect_settings(self) -> Dict[str, Any]:
+        """读取各控件当前的设置值"""
         language = "zh_CN" if self.language_combo.currentIndex() == 0 else "en_US"
-        self.config.set("ui_language", language)
-
-        # 性能设置
-        self.config.set("max_threads", self.max_threads_spin.value())
-        self.config.set("batch_size", self.batch_size_spin.value())
-
-        # GPU设置
-        self.config.set("gpu_acceleration", self.gpu_acceleration_cb.isChecked())
-        self.config.set("auto_detect_gpu", self.auto_detect_gpu_cb.isChecked())
+        return {
+            # 常规设置
+            "max_attempts": self.max_attempts_spin.value(),
+            "timeout_seconds": self.timeout_spin.value(),
+            "ui_language": language,
+            # 性能设置
+            "max_threads": self.max_threads_spin.value(),
+            "batch_size": self.batch_size_spin.value(),
+            # GPU设置
+            "gpu_acceleration": self.gpu_acceleration_cb.isChecked(),
+            "auto_detect_gpu": self.auto_detect_gpu_cb.isChecked(),
+            # 日志设置
+            "save_log": self.save_log_cb.isChecked(),
+            "log_directory": self.log_directory_edit.text(),
+        }
 
-        # 日志设置
-        self.config.set("save_log", self.save_log_cb.isChecked())
-        self.config.set("log_directory", self.log_directory_edit.text())
-
-        # 保存配置
-        self.config.save_config()
+    def apply_settings(self):
+        """应用设置 - 只合并加载后有改动的设置项，没有改动时不修改和保存配置"""
+        current = self._collect_settings()
+        changed = {
+            key: value
+            for key, value in current.items()
+            if self._loaded_snapshot.get(key) != value
+        }
+        if changed:
+            self.config.update(changed)
+        if changed or self._reset_pending:
+            # 延迟写入文件，确定按钮立即返回
+            self.config.mark_dirty()
+        self._reset_pending = False
+        self._loaded_snapshot = current
 
     def reset_settings(self):
-        """重置设置"""
+        """重置设置 - 内存中的配置恢复默认值，应用时写入配置文件"""
         self.config.reset_to_default()
+        self._reset_pending = True
         self.load_settings()
 
-    def refresh_gpu_info(self):
-        """刷新GPU信息"""
-        info_text = "GPU检测结果:\n\n"
-
-        if self.gpu_manager.is_gpu_available():
-            gpu_info = self.gpu_manager.get_gpu_info()
-            info_text += f"状态: 可用\n"
-            info_text += f"设备名称: {gpu_info.get('name', '未知')}\n"
-            info_text += f"类型: {gpu_info.get('type', '未知')}\n"
-
-            if "compute_capability" in gpu_info:
-                info_text += f"计算能力: {gpu_info['compute_capability']}\n"
-            if "total_memory" in gpu_info:
-                memory_gb = gpu_info["total_memory"] / (1024**3)
-                info_text += f"显存: {memory_gb:.1f} GB\n"
-            if "multiprocessor_count" in gpu_info:
-                info_text += f"多处理器数量: {gpu_info['multiprocessor_count']}\n"
+    def _on_tab_changed(self, index: int):
+        """首次显示GPU选项卡时加载GPU信息"""
+        if index == self._gpu_tab_index and not self._gpu_info_loaded:
+            self._gpu_info_loaded = True
+            self.refresh_gpu_info()
+
+    def on_refresh_clicked(self):
+        """刷新按钮 - 重新探测GPU，距上次手动刷新不足MIN_REFRESH_INTERVAL时忽略"""
+        now = time.monotonic()
+        if now - self._last_refresh_ts < self.MIN_REFRESH_INTERVAL:
+            return
+        self._last_refresh_ts = now
+        self.refresh_gpu_info(force=True)
+
+    def refresh_gpu_info(self, force: bool = False):
+        """刷新GPU信息 - 快照有效时直接显示，否则在后台线程探测，完成后显示"""
+        snapshot = _gpu_snapshot_cache["data"]
+        if (
+            not force
+            and snapshot is not None
+            and time.monotonic() - _gpu_snapshot_cache["ts"] < _GPU_SNAPSHOT_TTL
+        ):
+            self._apply_gpu_info(snapshot)
+            return
+
+        if self._probe_task is not None:
+            return
+        self._set_gpu_info_text("正在检测GPU...")
+        self.refresh_gpu_btn.setEnabled(False)
+        task = GPUSnapshotTask(self.gpu_manager, force)
+        task.signals.finished.connect(self._on_gpu_snapshot_ready)
+        self._probe_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_gpu_snapshot_ready(self, snapshot: Optional[Dict[str, Any]]):
+        """后台GPU探测完成"""
+        if self.gpu_manager is None and self._probe_task is not None:
+            self.gpu_manager = self._probe_task.gpu_manager
+        self._probe_task = None
+        self.refresh_gpu_btn.setEnabled(True)
+        if snapshot is None:
+            self._set_gpu_info_text("GPU检测失败")
+            return
+        _gpu_snapshot_cache["ts"] = time.monotonic()
+        _gpu_snapshot_cache["data"] = snapshot
+        self._apply_gpu_info(snapshot)
+
+    def _apply_gpu_info(self, snapshot: Dict[str, Any]):
+        """显示GPU检测结果快照"""
+        gpu_info = snapshot["gpu_info"]
+        system_info = snapshot["system_info"]
+        key = (
+            snapshot["available"],
+            gpu_info.get("name", "未知"),
+            gpu_info.get("type", "未知"),
+            gpu_info.get("compute_capability"),
+            gpu_info.get("total_memory"),
+            gpu_info.get("multiprocessor_count"),
+            system_info.get("cuda_available", False),
+            system_info.get("opencl_available", False),
+            system_info.get("nvidia_driver", False),
+        )
+        self._set_gpu_info_text(self._format_gpu_info(key))
+
+    def _set_gpu_info_text(self, text: str):
+        """更新GPU信息文本 - 内容未变化时不重建文档布局"""
+        document = self.gpu_info_text.document()
+        if document.toPlainText() != text:
+            document.setPlainText(text)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _format_gpu_info(key: tuple) -> str:
+        """生成GPU信息文本 - 按检测结果缓存，重复打开对话框时不再重新格式化"""
+        (
+            available,
+            name,
+            device_type,
+            compute_capability,
+            total_memory,
+            multiprocessor_count,
+            cuda_available,
+            opencl_available,
+            nvidia_driver,
+        ) = key
+        parts = ["GPU检测结果:", ""]
+
+        if available:
+            parts.append("状态: 可用")
+            parts.append(f"设备名称: {name}")
+            parts.append(f"类型: {device_type}")
+
+            if compute_capability is not None:
+                parts.append(f"计算能力: {compute_capability}")
+            if total_memory is not None:
+                parts.append(f"显存: {total_memory / (1024**3):.1f} GB")
+            if multiprocessor_count is not None:
+                parts.append(f"多处理器数量: {multiprocessor_count}")
         else:
-            info_text += "状态: 不可用\n"
-            info_text += "未检测到支持的GPU设备\n\n"
+            parts.append("状态: 不可用")
+            parts.append("未检测到支持的GPU设备")
+            parts.append("")
 
             # 显示系统信息
-            system_info = GPUManager.get_system_info()
-            info_text += "系统信息:\n"
-            info_text += f"CUDA支持: {'是' if system_info.get('cuda_available', False) else '否'}\n"
-            info_text += f"OpenCL支持: {'是' if system_info.get('opencl_available', False) else '否'}\n"
-            info_text += f"NVIDIA驱动: {'是' if system_info.get('nvidia_driver', False) else '否'}\n"
+            parts.append("系统信息:")
+            parts.append(f"CUDA支持: {'是' if cuda_available else '否'}")
+            parts.append(f"OpenCL支持: {'是' if opencl_available else '否'}")
+            parts.append(f"NVIDIA驱动: {'是' if nvidia_driver else '否'}")
 
-        self.gpu_info_text.setPlainText(info_text)
+        return "\n".join(parts) + "\n"
 
     def browse_log_directory(self):
         """浏览日志目录"""
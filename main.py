@@ -3,12 +3,11 @@ CompressPasswordProbe - 压缩文件密码破解工具
 主入口模块
 """
 
+import multiprocessing
 import sys
 import os
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QCoreApplication
-from gui.main_window_simple import MainWindow
-from core.config import Config
 
 
 def main():
@@ -21,8 +20,14 @@ def main():
     # 创建应用程序实例
     app = QApplication(sys.argv)
 
+    # 界面和核心模块在应用程序实例创建后才导入，作为库导入本模块时不加载整个界面
+    from core.config import Config
+    from gui.main_window_simple import MainWindow
+
     # 初始化配置
     config = Config()
+    # 退出前写入尚未保存的配置修改
+    app.aboutToQuit.connect(config.flush_if_dirty)
 
     # 创建主窗口
     main_window = MainWindow(config)
@@ -33,4 +38,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序中，spawn启动的批量测试工作进程在这里转去执行工作函数，而不是再打开一个界面
+    multiprocessing.freeze_support()
     main()
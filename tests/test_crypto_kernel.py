@@ -0,0 +1,133 @@
+"""
+crypto_kernel 密码预检的回归测试
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import crypto_kernel
+
+
+def _rar5_check(pw_bytes: bytes, salt: bytes, kdf_shift: int) -> bytes:
+    """按RAR5规则计算密码校验值"""
+    value = hashlib.pbkdf2_hmac("sha256", pw_bytes, salt, (1 << kdf_shift) + 32)
+    check = bytearray(8)
+    for i, b in enumerate(value):
+        check[i & 7] ^= b
+    return bytes(check)
+
+
+def _reference_7z_key(password: str, salt: bytes, cycles: int) -> bytes:
+    """逐轮计算的7z密钥派生，作为优化实现的对照"""
+    sha = hashlib.sha256()
+    seed = salt + password.encode("utf-16-le")
+    for counter in range(1 << cycles):
+        sha.update(seed + counter.to_bytes(8, "little"))
+    return sha.digest()
+
+
+def _build_encrypted_header_7z(path: str, password: str, header: bytes, cycles: int = 6) -> None:
+    """写出只有AES加密头部（头部不压缩）的最小7z文件"""
+    iv = bytes(range(16))
+    key = crypto_kernel.derive_7z_key(password.encode("utf-16-le"), b"", cycles)
+    padded = header + bytes(-len(header) % 16)
+    encryptor = crypto_kernel.Cipher(
+        crypto_kernel.algorithms.AES(key), crypto_kernel.modes.CBC(iv)
+    ).encryptor()
+    packed = encryptor.update(padded) + encryptor.finalize()
+
+    # 无盐、16字节IV的7zAES属性
+    aes_props = bytes([0x40 | cycles, 0x0F]) + iv
+    encoded_header = (
+        bytes([0x17, 0x06, 0x00, 0x01, 0x09, len(packed), 0x00])
+        + bytes([0x07, 0x0B, 0x01, 0x00, 0x01, 0x24])
+        + b"\x06\xf1\x07\x01"
+        + bytes([len(aes_props)])
+        + aes_props
+        + bytes([0x0C, len(header), 0x00, 0x00])
+    )
+    start_header = struct.pack(
+        "<QQI", len(packed), len(encoded_header), zlib.crc32(encoded_header)
+    )
+    with open(path, "wb") as f:
+        f.write(crypto_kernel.SEVENZIP_SIGNATURE + b"\x00\x04")
+        f.write(struct.pack("<I", zlib.crc32(start_header)) + start_header)
+        f.write(packed + encoded_header)
+
+
+# 只有一个空文件的头部：Header, FilesInfo(1个文件, EmptyStream, Name), End
+_EMPTY_FILE_HEADER = (
+    bytes([0x01, 0x05, 0x01, 0x0E, 0x01, 0x80, 0x11, 0x0D, 0x00])
+    + "a.txt\0".encode("utf-16-le")
+    + bytes([0x00, 0x00])
+)
+# 空压缩包的头部：Header, End
+_EMPTY_ARCHIVE_HEADER = bytes([0x01, 0x00])
+
+
+class SevenZipKeyTest(unittest.TestCase):
+    def test_derive_key_matches_reference(self):
+        # 17轮次跨越两个KDF块，覆盖计数器高位字节的改写
+        for password, salt, cycles in (("", b"", 0), ("密码", b"salt", 5), ("abc", b"", 17)):
+            self.assertEqual(
+                crypto_kernel.derive_7z_key(password.encode("utf-16-le"), salt, cycles),
+                _reference_7z_key(password, salt, cycles),
+            )
+
+    def test_derive_key_without_hashing(self):
+        key = crypto_kernel.derive_7z_key("ab".encode("utf-16-le"), b"s", 0x3F)
+        self.assertEqual(key, b"sa\x00b\x00".ljust(32, b"\x00"))
+
+
+@unittest.skipIf(crypto_kernel.Cipher is None, "需要cryptography")
+class SevenZipEncryptedHeaderTest(unittest.TestCase):
+    def _params(self, header: bytes, password: str) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test.7z")
+            _build_encrypted_header_7z(path, password, header)
+            params = crypto_kernel.read_7z_aes_params(path)
+        self.assertIsNotNone(params)
+        return params
+
+    def test_only_empty_files(self):
+        params = self._params(_EMPTY_FILE_HEADER, "secret")
+        self.assertTrue(crypto_kernel.verify_7z_password("secret", params))
+        self.assertFalse(crypto_kernel.verify_7z_password("wrong", params))
+
+    def test_empty_archive(self):
+        params = self._params(_EMPTY_ARCHIVE_HEADER, "密码")
+        self.assertTrue(crypto_kernel.verify_7z_password("密码", params))
+
+
+class Rar5PasswordTest(unittest.TestCase):
+    SALT = bytes(range(16))
+
+    def _params(self, pw_bytes: bytes) -> dict:
+        return {
+            "version": 5,
+            "salt": self.SALT,
+            "kdf_shift": 0,
+            "check": _rar5_check(pw_bytes, self.SALT, 0),
+        }
+
+    def test_correct_password(self):
+        params = self._params("密码abc".encode("utf-8"))
+        self.assertTrue(crypto_kernel.verify_rar_password("密码abc", params))
+        self.assertFalse(crypto_kernel.verify_rar_password("密码abd", params))
+
+    def test_truncation_inside_surrogate_pair(self):
+        # 截断到127个UTF-16单元时落在表情符号的代理对中间，孤立的高位代理被丢弃
+        password = "a" * 126 + "\U0001F600"
+        params = self._params(b"a" * 126)
+        self.assertTrue(crypto_kernel.verify_rar_password(password, params))
+
+
+if __name__ == "__main__":
+    unittest.main()